@@ -4,14 +4,25 @@ Autopsy Pro v3 - Enhanced Code Extraction and Project Rebuilding Tool
 Extract high-quality code fragments from inactive projects and rebuild them
 into new, organized projects.
 """
+import importlib
 
 __version__ = "3.0.0"
 __author__ = "Autopsy Pro Team"
 
-from .models import Project, Fragment, ScanResult, ExtractionResult, BuildResult
-from .config import Config, load_config, save_config
-from .scanner import scan_projects
-from .extractor import extract_fragments
+# Public names are resolved lazily (PEP 562) so that importing the package,
+# e.g. for `autopsy-pro --help`, does not pull in the scanner and extractor
+_LAZY = {
+    'Project': 'models',
+    'Fragment': 'models',
+    'ScanResult': 'models',
+    'ExtractionResult': 'models',
+    'BuildResult': 'models',
+    'Config': 'config',
+    'load_config': 'config',
+    'save_config': 'config',
+    'scan_projects': 'scanner',
+    'extract_fragments': 'extractor',
+}
 
 __all__ = [
     'Project',
@@ -25,3 +36,16 @@ __all__ = [
     'scan_projects',
     'extract_fragments',
 ]
+
+
+def __getattr__(name):
+    if name not in _LAZY:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_LAZY[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,26 +1,41 @@
 """Command-line interface for Autopsy Pro"""
 import argparse
+import functools
 import sys
-import json
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, Iterator, List
 import logging
+from dataclasses import fields, replace
 
 from .config import load_config, save_config, Config, get_export_path, clear_cache
-from .scanner import scan_projects
-from .extractor import extract_fragments
-from .models import Fragment, Project
+from .utils import dumps_json, loads_json, write_bytes
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 
+def iter_projects_from_file(path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Yield project dicts from a saved scan result
+
+    With ijson installed the file is stream-parsed, so only one project's
+    dict is alive at a time instead of the whole decoded document.
+    """
+    with open(path, 'rb') as f:
+        if ijson is not None:
+            yield from ijson.items(f, 'projects.item', use_float=True)
+        else:
+            yield from loads_json(f.read())['projects']
+
+
 def cmd_scan(args):
     """Scan for projects"""
+    from .scanner import scan_projects
+
     config = load_config()
     
     # Override config with CLI args
@@ -29,7 +44,7 @@ def cmd_scan(args):
     if args.include_active:
         config.include_active = True
     if args.extensions:
-        config.exts = args.extensions.split(',')
+        config.exts = tuple(args.extensions.split(','))
     
     base_path = Path(args.directory).expanduser().resolve()
     
@@ -55,8 +70,7 @@ def cmd_scan(args):
     # Save if requested
     if args.output:
         output_path = Path(args.output)
-        with open(output_path, 'w') as f:
-            json.dump(result.to_dict(), f, indent=2)
+        write_bytes(output_path, dumps_json(result.to_dict(), pretty=True))
         print(f"\nResults saved to: {output_path}")
     
     return 0
@@ -64,6 +78,10 @@ def cmd_scan(args):
 
 def cmd_extract(args):
     """Extract code fragments"""
+    from .models import Project
+    from .scanner import scan_projects
+    from .extractor import extract_fragments
+
     config = load_config()
     
     # Override config
@@ -81,12 +99,7 @@ def cmd_extract(args):
             print(f"Error: Scan file not found: {scan_file}")
             return 1
         
-        with open(scan_file, 'r') as f:
-            scan_data = json.load(f)
-        
-        from .models import ScanResult
-        scan_result = ScanResult.from_dict(scan_data)
-        projects = scan_result.projects
+        projects = [Project.from_dict(p) for p in iter_projects_from_file(scan_file)]
     else:
         # Need to scan first
         base_path = Path(args.directory).expanduser().resolve()
@@ -96,7 +109,7 @@ def cmd_extract(args):
         print(f"Found {len(projects)} projects")
     
     print(f"Extracting fragments...")
-    result = extract_fragments(projects, config)
+    result = extract_fragments(projects, config, use_cache=not args.no_cache)
     
     print(f"\nExtraction Results:")
     print(f"  Fragments extracted: {len(result.fragments)}")
@@ -114,8 +127,7 @@ def cmd_extract(args):
     # Save if requested
     if args.output:
         output_path = Path(args.output)
-        with open(output_path, 'w') as f:
-            json.dump(result.to_dict(), f, indent=2)
+        write_bytes(output_path, dumps_json(result.to_dict(), pretty=True))
         print(f"\nResults saved to: {output_path}")
     
     return 0
@@ -123,6 +135,8 @@ def cmd_extract(args):
 
 def cmd_export(args):
     """Export fragment collection"""
+    from .models import ExtractionResult
+
     # Load fragments
     if not args.fragments_file:
         print("Error: --fragments-file required for export")
@@ -133,10 +147,9 @@ def cmd_export(args):
         print(f"Error: Fragments file not found: {fragments_file}")
         return 1
     
-    with open(fragments_file, 'r') as f:
-        data = json.load(f)
+    with open(fragments_file, 'rb') as f:
+        data = loads_json(f.read())
     
-    from .models import ExtractionResult
     result = ExtractionResult.from_dict(data)
     
     # Filter if requested
@@ -149,21 +162,21 @@ def cmd_export(args):
     print(f"Exporting {len(fragments)} fragments...")
     
     # Create export
+    selection = ExtractionResult(fragments=fragments, extraction_time=result.extraction_time)
     export_data = {
         'name': args.name or 'export',
         'description': args.description or 'Exported fragment collection',
         'fragments': [f.to_dict() for f in fragments],
         'metadata': {
             'total': len(fragments),
-            'avg_quality': sum(f.quality for f in fragments) / len(fragments) if fragments else 0,
-            'languages': list({f.language for f in fragments})
+            'avg_quality': selection.avg_quality,
+            'languages': list(selection.languages)
         }
     }
     
     # Save
     export_path = get_export_path(args.name or 'export')
-    with open(export_path, 'w') as f:
-        json.dump(export_data, f, indent=2)
+    write_bytes(export_path, dumps_json(export_data))
     
     print(f"Export saved to: {export_path}")
     return 0
@@ -176,8 +189,8 @@ def cmd_import(args):
         print(f"Error: Import file not found: {import_file}")
         return 1
     
-    with open(import_file, 'r') as f:
-        data = json.load(f)
+    with open(import_file, 'rb') as f:
+        data = loads_json(f.read())
     
     print(f"Import: {data.get('name', 'Unknown')}")
     print(f"Description: {data.get('description', 'N/A')}")
@@ -196,12 +209,25 @@ def cmd_import(args):
     return 0
 
 
+def _coerce_config_value(value: str, field_type: Any) -> Any:
+    """Convert a --set string to the declared type of a Config field"""
+    if field_type is bool:
+        lowered = value.lower()
+        if lowered not in ('true', 'false'):
+            raise ValueError(f"expected true or false, got {value!r}")
+        return lowered == 'true'
+    if field_type in (int, float, str):
+        return field_type(value)
+    # Collection fields (exts, ignore) take comma-separated values
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
 def cmd_config(args):
     """Manage configuration"""
     if args.show:
-        config = load_config()
+        config = load_config(validate=False)
         print("Current Configuration:")
-        print(json.dumps(config.to_dict(), indent=2))
+        print(dumps_json(config.to_dict(), pretty=True).decode('utf-8'))
     elif args.reset:
         config = Config()
         save_config(config)
@@ -210,24 +236,23 @@ def cmd_config(args):
         config = load_config()
         key, value = args.set.split('=', 1)
         
-        # Parse value
-        if value.lower() in ['true', 'false']:
-            value = value.lower() == 'true'
-        elif value.isdigit():
-            value = int(value)
-        elif '.' in value and value.replace('.', '').isdigit():
-            value = float(value)
+        config_fields = {f.name: f for f in fields(Config)}
+        if key not in config_fields:
+            print(f"Error: Unknown config key: {key}")
+            return 1
         
-        # Set value
-        if hasattr(config, key):
-            setattr(config, key, value)
-            if save_config(config):
-                print(f"Set {key} = {value}")
-            else:
-                print(f"Error: Could not save configuration")
-                return 1
+        try:
+            value = _coerce_config_value(value, config_fields[key].type)
+        except ValueError as e:
+            print(f"Error: Invalid value for {key}: {e}")
+            return 1
+        
+        # replace() re-runs Config.__post_init__, which freezes list values
+        config = replace(config, **{key: value})
+        if save_config(config):
+            print(f"Set {key} = {value}")
         else:
-            print(f"Error: Unknown config key: {key}")
+            print(f"Error: Could not save configuration")
             return 1
     
     return 0
@@ -236,14 +261,15 @@ def cmd_config(args):
 def cmd_cache(args):
     """Manage cache"""
     if args.clear:
-        clear_cache()
+        clear_cache(max_workers=load_config().max_workers)
         print("Cache cleared")
     
     return 0
 
 
-def main():
-    """Main CLI entry point"""
+@functools.lru_cache(maxsize=1)
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the argument parser (once per process)"""
     parser = argparse.ArgumentParser(
         description='Autopsy Pro - Extract and rebuild code from inactive projects'
     )
@@ -267,6 +293,7 @@ def main():
     extract_parser.add_argument('--min-quality', type=int, help='Minimum quality score')
     extract_parser.add_argument('--skip-tests', action='store_true', help='Skip test fragments')
     extract_parser.add_argument('--no-dedupe', action='store_true', help='Disable deduplication')
+    extract_parser.add_argument('--no-cache', action='store_true', help='Disable cache')
     extract_parser.add_argument('-o', '--output', help='Save results to file')
     extract_parser.add_argument('-v', '--verbose', action='store_true', help='Verbose output')
     
@@ -293,6 +320,18 @@ def main():
     cache_parser = subparsers.add_parser('cache', help='Manage cache')
     cache_parser.add_argument('--clear', action='store_true', help='Clear cache')
     
+    return parser
+
+
+def main():
+    """Main CLI entry point"""
+    # No-op if the host application already configured logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    parser = _build_parser()
     args = parser.parse_args()
     
     if not args.command:
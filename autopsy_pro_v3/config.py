@@ -1,24 +1,61 @@
 """Enhanced configuration management with validation and defaults"""
-import json
+import functools
+import os
+import pickle
+import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass, asdict
+from typing import Dict, Any, FrozenSet, Iterator, List, Optional, Tuple
+from dataclasses import dataclass, asdict, replace
 import logging
 
+from .utils import atomic_write_bytes, dumps_json, loads_json
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
 logger = logging.getLogger(__name__)
 
 CONFIG_DIR = Path.home() / ".autopsy_pro"
 CONFIG_FILE = CONFIG_DIR / "config.json"
 CACHE_DIR = CONFIG_DIR / "cache"
 EXPORT_DIR = CONFIG_DIR / "exports"
+# Binary copy of config.json, only used while it matches the JSON file
+CONFIG_SIDECAR_FILE = CACHE_DIR / "config.cache.msgpack"
+
+# Cache codecs by Config.cache_format. Cache files are machine-read only, so
+# "auto" picks a binary codec at run time: msgpack when it is installed,
+# otherwise pickle
+CACHE_FORMATS = {"json": ".json", "msgpack": ".msgpack", "pickle": ".pickle"}
+_CACHE_SUFFIXES = tuple(CACHE_FORMATS.values())
+
+# Set once ensure_dirs() has created the directories above
+_dirs_ready = False
+
+# Anything outside this ASCII set is replaced when building file names
+_SANITIZE_RE = re.compile(r'[^A-Za-z0-9._-]')
+
+
+DEFAULT_EXTS = (
+    ".py", ".js", ".jsx", ".ts", ".tsx",
+    ".go", ".rs", ".java", ".c", ".cpp", ".h", ".hpp",
+    ".rb", ".php", ".swift", ".kt", ".scala"
+)
+DEFAULT_IGNORE = frozenset({
+    ".git", "node_modules", "__pycache__", "venv", ".venv",
+    "env", "build", "dist", ".idea", ".vscode", "target",
+    "vendor", ".next", ".nuxt", "coverage"
+})
 
 
 @dataclass
 class Config:
     """Configuration data class with defaults"""
     # Scanning
-    exts: List[str] = None
-    ignore: List[str] = None
+    exts: Tuple[str, ...] = DEFAULT_EXTS
+    ignore: FrozenSet[str] = DEFAULT_IGNORE
     inactive_days: int = 60
     include_active: bool = False
     max_file_mb: float = 1.0
@@ -29,6 +66,7 @@ class Config:
     max_lines: int = 500
     skip_tests: bool = False
     deduplicate: bool = True
+    include_nested: bool = True  # Python defs inside function bodies
     
     # Building
     organize_by_type: bool = True
@@ -45,30 +83,35 @@ class Config:
     max_workers: int = 4
     enable_cache: bool = True
     cache_ttl_hours: int = 24
+    cache_format: str = "auto"  # auto, json, msgpack or pickle
     
     def __post_init__(self):
-        """Set defaults for None values"""
-        if self.exts is None:
-            self.exts = [
-                ".py", ".js", ".jsx", ".ts", ".tsx",
-                ".go", ".rs", ".java", ".c", ".cpp", ".h", ".hpp",
-                ".rb", ".php", ".swift", ".kt", ".scala"
-            ]
-        if self.ignore is None:
-            self.ignore = [
-                ".git", "node_modules", "__pycache__", "venv", ".venv",
-                "env", "build", "dist", ".idea", ".vscode", "target",
-                "vendor", ".next", ".nuxt", "coverage"
-            ]
+        """Freeze collection fields passed in as lists"""
+        self._freeze()
+    
+    def _freeze(self):
+        """
+        Normalize exts to a tuple and ignore to a frozenset
+
+        The tuple can be handed straight to str.endswith() and the frozenset
+        gives O(1) membership tests for directory names in the scanner.
+        """
+        if not isinstance(self.exts, tuple):
+            self.exts = tuple(self.exts)
+        if not isinstance(self.ignore, frozenset):
+            self.ignore = frozenset(self.ignore)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
-        return asdict(self)
+        data = asdict(self)
+        data['exts'] = list(self.exts)
+        data['ignore'] = sorted(self.ignore)
+        return data
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Config':
         """Create from dictionary"""
-        return cls(**{k: v for k, v in data.items() if hasattr(cls, k)})
+        return cls(**{k: v for k, v in data.items() if hasattr(cls, k) and v is not None})
     
     def validate(self) -> List[str]:
         """Validate configuration, return list of issues"""
@@ -88,37 +131,68 @@ class Config:
             issues.append("max_workers must be >= 1")
         if self.cache_ttl_hours < 1:
             issues.append("cache_ttl_hours must be >= 1")
+        if self.cache_format != "auto" and self.cache_format not in CACHE_FORMATS:
+            issues.append(f"cache_format must be auto or one of {', '.join(CACHE_FORMATS)}")
         
         return issues
 
 
 def ensure_dirs():
-    """Ensure required directories exist"""
+    """Ensure required directories exist (at most once per process)"""
+    global _dirs_ready
+    if _dirs_ready:
+        return
     CONFIG_DIR.mkdir(parents=True, exist_ok=True)
     CACHE_DIR.mkdir(exist_ok=True)
     EXPORT_DIR.mkdir(exist_ok=True)
+    _dirs_ready = True
+
+
+def _reset_dirs_ready_for_tests():
+    """Make the next ensure_dirs() call create the directories again"""
+    global _dirs_ready
+    _dirs_ready = False
+
 
+def load_config(*, validate: bool = True) -> Config:
+    """
+    Load configuration from file or create default
 
-def load_config() -> Config:
-    """Load configuration from file or create default"""
+    The file is only parsed once per process; each call returns a fresh copy
+    so callers can apply overrides without affecting later loads. Pass
+    validate=False for display-only callers that want the config exactly as
+    it is on disk, even if some values are invalid.
+    """
+    return replace(_load_config_cached(validate))
+
+
+def invalidate_config_cache():
+    """Force the next load_config() call to re-read the config file"""
+    _load_config_cached.cache_clear()
+
+
+@functools.lru_cache(maxsize=2)
+def _load_config_cached(validate: bool) -> Config:
+    """Load configuration from disk (memoized by load_config)"""
     ensure_dirs()
     
     if CONFIG_FILE.exists():
         try:
-            with open(CONFIG_FILE, 'r') as f:
-                data = json.load(f)
-            config = Config.from_dict(data)
+            config = Config.from_dict(_read_config_data())
+            
+            if not validate:
+                return config
             
             # Validate
             issues = config.validate()
             if issues:
-                logger.warning(f"Config validation issues: {issues}")
+                logger.warning("Config validation issues: %s", issues)
                 logger.warning("Using defaults for invalid values")
                 return Config()
             
             return config
         except Exception as e:
-            logger.error(f"Error loading config: {e}")
+            logger.error("Error loading config: %s", e)
             logger.info("Using default configuration")
             return Config()
     else:
@@ -127,6 +201,36 @@ def load_config() -> Config:
         return config
 
 
+def _read_config_data() -> Dict[str, Any]:
+    """
+    Read the raw config dict, preferring the msgpack sidecar
+
+    config.json stays the user-editable source of truth; the sidecar is only
+    trusted while the JSON file's mtime and size match what it recorded.
+    """
+    st = CONFIG_FILE.stat()
+    stamp = [st.st_mtime_ns, st.st_size]
+    
+    if msgpack is not None:
+        try:
+            sidecar = load_cache(CONFIG_SIDECAR_FILE)
+            if sidecar.get('stamp') == stamp:
+                return sidecar['data']
+        except Exception:
+            pass  # Missing or stale sidecar, fall back to JSON
+    
+    with open(CONFIG_FILE, 'rb') as f:
+        data = loads_json(f.read())
+    
+    if msgpack is not None:
+        try:
+            dump_cache({'stamp': stamp, 'data': data}, CONFIG_SIDECAR_FILE)
+        except OSError as e:
+            logger.debug("Could not write config sidecar: %s", e)
+    
+    return data
+
+
 def save_config(config: Config) -> bool:
     """Save configuration to file"""
     ensure_dirs()
@@ -134,40 +238,115 @@ def save_config(config: Config) -> bool:
     # Validate before saving
     issues = config.validate()
     if issues:
-        logger.error(f"Cannot save invalid config: {issues}")
+        logger.error("Cannot save invalid config: %s", issues)
         return False
     
     try:
-        with open(CONFIG_FILE, 'w') as f:
-            json.dump(config.to_dict(), f, indent=2)
-        logger.info(f"Configuration saved to {CONFIG_FILE}")
+        # Pretty-printed because config.json is meant to be hand-edited
+        data = dumps_json(config.to_dict(), pretty=True)
+        try:
+            unchanged = CONFIG_FILE.read_bytes() == data
+        except OSError:
+            unchanged = False
+        
+        # Only touch (and fsync) the file when the content actually changes
+        if not unchanged:
+            atomic_write_bytes(CONFIG_FILE, data, fsync=True)
+            invalidate_config_cache()
+        logger.info("Configuration saved to %s", CONFIG_FILE)
         return True
     except Exception as e:
-        logger.error(f"Error saving config: {e}")
+        logger.error("Error saving config: %s", e)
         return False
 
 
-def get_cache_path(key: str) -> Path:
-    """Get cache file path for a key"""
+def resolve_cache_format(cache_format: str) -> str:
+    """
+    Resolve a Config.cache_format value to an available codec
+
+    "auto" (or msgpack when it is not installed) becomes msgpack if it is
+    available and pickle otherwise. Resolved here rather than stored in
+    the config, so config.json stays portable between environments.
+    """
+    if cache_format not in CACHE_FORMATS or (cache_format == "msgpack" and msgpack is None):
+        return "msgpack" if msgpack is not None else "pickle"
+    return cache_format
+
+
+def get_cache_path(key: str, cache_format: str = "auto") -> Path:
+    """
+    Get cache file path for a key
+
+    The suffix selects the codec used by dump_cache/load_cache.
+    """
     ensure_dirs()
     # Sanitize key for filename
-    safe_key = "".join(c if c.isalnum() or c in "._-" else "_" for c in key)
-    return CACHE_DIR / f"{safe_key}.json"
+    safe_key = _SANITIZE_RE.sub("_", key)
+    return CACHE_DIR / f"{safe_key}{CACHE_FORMATS[resolve_cache_format(cache_format)]}"
+
+
+def dump_cache(data: Any, path: Path) -> None:
+    """
+    Serialize data to a cache file using the cache codec
+
+    The file is replaced atomically, so a crash mid-write cannot leave a
+    truncated cache that fails to load and forces a full rescan.
+    """
+    if path.suffix == ".msgpack":
+        raw = msgpack.packb(data, use_bin_type=True)
+    elif path.suffix == ".pickle":
+        raw = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        raw = dumps_json(data)
+    atomic_write_bytes(path, raw)
+
+
+def load_cache(path: Path) -> Any:
+    """Deserialize a cache file written by dump_cache"""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    if path.suffix == ".msgpack":
+        return msgpack.unpackb(raw, raw=False)
+    if path.suffix == ".pickle":
+        return pickle.loads(raw)
+    return loads_json(raw)
 
 
 def get_export_path(name: str) -> Path:
     """Get export file path"""
     ensure_dirs()
-    safe_name = "".join(c if c.isalnum() or c in "._-" else "_" for c in name)
+    safe_name = _SANITIZE_RE.sub("_", name)
     return EXPORT_DIR / f"{safe_name}.json"
 
 
-def clear_cache():
+def iter_cache_files() -> Iterator[os.DirEntry]:
+    """
+    Yield directory entries for all cache files
+
+    Uses os.scandir so entry type information comes from the directory
+    listing itself rather than an extra stat() per file.
+    """
+    try:
+        with os.scandir(CACHE_DIR) as it:
+            for entry in it:
+                if entry.name.endswith(_CACHE_SUFFIXES) and entry.is_file():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+def _safe_unlink(entry: os.DirEntry):
+    """Delete a cache file, logging rather than raising on failure"""
+    try:
+        os.unlink(entry.path)
+    except Exception as e:
+        logger.error("Error deleting cache file %s: %s", entry.path, e)
+
+
+def clear_cache(max_workers: int = 4):
     """Clear all cached data"""
     if CACHE_DIR.exists():
-        for cache_file in CACHE_DIR.glob("*.json"):
-            try:
-                cache_file.unlink()
-            except Exception as e:
-                logger.error(f"Error deleting cache file {cache_file}: {e}")
+        # Unlinks are syscall-bound and release the GIL, so overlap them
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_safe_unlink, iter_cache_files()))
         logger.info("Cache cleared")
@@ -1,76 +1,194 @@
 """Enhanced code extraction with improved quality scoring, parallel processing, and semantic analysis"""
+import os
 import re
 import ast
 import time
+import atexit
+import functools
+import multiprocessing
+import threading
 from pathlib import Path
-from typing import List, Tuple, Set, Dict
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import List, Tuple, Set, Dict, Iterator, Optional
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from operator import attrgetter, itemgetter
 import logging
 
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 from .models import Fragment, ExtractionResult, Project
 from .config import Config
-from .utils import safe_read_text, stable_uid
+from .inc_cache import IncrementalCache
+from .utils import content_hash, decode_text, stable_uid
 
 logger = logging.getLogger(__name__)
 
 
+# Decision points, one alternation per language family so each fragment is
+# scanned once instead of once per keyword
+_PY_COMPLEXITY_RE = re.compile(r'\b(?:if|elif|else|for|while|except|and|or)\b')
+_OTHER_COMPLEXITY_RE = re.compile(r'\b(?:if|elif|else|for|while|except|case|catch)\b')
+_COMPLEXITY_OPERATORS = ('&&', '||', '?')
+
+# JS/TS definitions, one capture group (the name) per pattern. They are
+# scanned as a single alternation, so each definition yields one fragment
+# and the earlier pattern wins where several match at the same position.
+_JS_PATTERNS = (
+    (r"(?:export\s+)?(?:async\s+)?function\s+(\w+)", "Function"),
+    (r"(?:export\s+)?class\s+(\w+)", "Class"),
+    (r"(?:export\s+)?const\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>", "ArrowFunc"),
+    (r"(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*\([^)]*\)\s*=>", "Component"),
+)
+_JS_DEFINITION_RE = re.compile('|'.join(f'(?:{pattern})' for pattern, _ in _JS_PATTERNS))
+_JS_DEFINITION_TYPES = tuple(frag_type for _, frag_type in _JS_PATTERNS)
+_JS_IMPORT_RE = re.compile(r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]')
+
+# Substring markers looked for by assess_quality_enhanced, matched in one pass
+# over the lowercased fragment. The lookahead reports overlapping hits and no
+# marker is a prefix of another, so this finds exactly what `kw in text` would.
+_QUALITY_MARKERS = (
+    'async', 'await',
+    'try', 'catch', 'except', 'error', 'throw',
+    'export', 'interface', 'type ',
+    'todo', 'fixme', 'hack',
+    'console.log', 'print(', 'println', 'fmt.println', 'debugger',
+    'test', 'spec', 'describe',
+)
+_QUALITY_RE = re.compile('(?=(' + '|'.join(map(re.escape, _QUALITY_MARKERS)) + '))')
+_ERROR_MARKERS = frozenset(('try', 'catch', 'except', 'error', 'throw'))
+_TODO_MARKERS = frozenset(('todo', 'fixme', 'hack'))
+_DEBUG_MARKERS = frozenset(('console.log', 'print(', 'println', 'fmt.println', 'debugger'))
+_TEST_MARKERS = frozenset(('test', 'spec', 'describe'))
+
+
+def _compile_quality_db():
+    """Compile the quality markers into a Hyperscan literal database, if available"""
+    if hyperscan is None:
+        return None
+    try:
+        db = hyperscan.Database()
+        db.compile(
+            expressions=[re.escape(marker).encode() for marker in _QUALITY_MARKERS],
+            ids=list(range(len(_QUALITY_MARKERS))),
+            elements=len(_QUALITY_MARKERS),
+            # Only presence matters, so stop reporting a marker after its first hit
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(_QUALITY_MARKERS),
+        )
+        return db
+    except Exception as e:
+        logger.debug(f"Hyperscan unavailable for quality markers: {e}")
+        return None
+
+
+def _build_quality_automaton():
+    """Build an Aho-Corasick automaton over the quality markers, if available"""
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for marker in _QUALITY_MARKERS:
+        automaton.add_word(marker, marker)
+    automaton.make_automaton()
+    return automaton
+
+
+_QUALITY_DB = _compile_quality_db()
+# pyahocorasick ships wheels for platforms Hyperscan does not support
+_QUALITY_AUTOMATON = _build_quality_automaton() if _QUALITY_DB is None else None
+
+
+def _find_quality_markers(text: str) -> Set[str]:
+    """Return the quality markers that occur in the lowercased fragment text"""
+    if _QUALITY_DB is None:
+        if _QUALITY_AUTOMATON is not None:
+            return {marker for _, marker in _QUALITY_AUTOMATON.iter(text)}
+        return set(_QUALITY_RE.findall(text))
+
+    found = set()
+
+    def on_match(marker_id, start, end, flags, context):
+        found.add(_QUALITY_MARKERS[marker_id])
+
+    # Markers are ASCII, so matching UTF-8 bytes is the same as matching text
+    _QUALITY_DB.scan(text.encode('utf-8', 'surrogatepass'), match_event_handler=on_match)
+    return found
+
+
 def compute_complexity(code: str, lang: str) -> int:
     """
     Compute cyclomatic complexity estimate
     """
     complexity = 1  # Base complexity
 
-    # Decision points - separate keywords from operators
-    python_keywords = ['if', 'elif', 'else', 'for', 'while', 'except']
-    other_keywords = ['case', 'catch']
-    operators = ['&&', '||', '?']
-
     if lang in ['py', 'python']:
-        # Use word boundaries for Python keywords only
-        for keyword in python_keywords:
-            complexity += len(re.findall(rf'\b{re.escape(keyword)}\b', code))
         # Python uses 'and', 'or' instead of &&, ||
-        complexity += len(re.findall(r'\b(and|or)\b', code))
+        complexity += len(_PY_COMPLEXITY_RE.findall(code))
     else:
-        # For other languages, use word boundaries for keywords
-        for keyword in python_keywords + other_keywords:
-            complexity += len(re.findall(rf'\b{re.escape(keyword)}\b', code))
+        complexity += len(_OTHER_COMPLEXITY_RE.findall(code))
         # Count operators separately without word boundaries
-        for operator in operators:
+        for operator in _COMPLEXITY_OPERATORS:
             complexity += code.count(operator)
 
     return complexity
 
 
+# Line starts and leading blanks as seen by str.splitlines() and str.strip()
+_LINE_START = r'(?:\A|(?<=[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]))'
+_LINE_INDENT = r'[^\S\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]*'
+_NONBLANK_LINE_RE = re.compile(f'{_LINE_START}({_LINE_INDENT})\\S')
+
+
+def _doc_line_re(*markers: str) -> 're.Pattern':
+    """
+    Build a regex with one match per non-blank line, capturing its indent
+    and the comment marker when the line starts with one
+    """
+    marker = '|'.join(map(re.escape, markers))
+    return re.compile(f'{_LINE_START}({_LINE_INDENT})(?:({marker})|\\S)')
+
+
+_PY_DOC_RE = _doc_line_re('#', '"""', "'''")
+_C_STYLE_DOC_RE = _doc_line_re('//', '/*', '*')
+_DOC_LINE_RES = {
+    'py': _PY_DOC_RE,
+    'python': _PY_DOC_RE,
+    'ruby': _doc_line_re('#'),
+    'php': _doc_line_re('//', '#', '/*'),
+    **{lang: _C_STYLE_DOC_RE for lang in ('js', 'javascript', 'typescript', 'go', 'rust', 'java', 'c', 'cpp')},
+}
+
+
+def _scan_lines(code: str, lang: str) -> Tuple[int, int, int]:
+    """
+    Count non-blank and comment lines and find the deepest indent in one pass
+    Returns: (code_lines, doc_lines, max_indent)
+    """
+    doc_re = _DOC_LINE_RES.get(lang)
+    if doc_re is None:
+        indents = _NONBLANK_LINE_RE.findall(code)
+        return len(indents), 0, max(map(len, indents), default=0)
+    
+    # One match per non-blank line; the marker is empty unless it is a comment
+    rows = doc_re.findall(code)
+    if not rows:
+        return 0, 0, 0
+    indents, markers = zip(*rows)
+    return len(rows), len(rows) - markers.count(''), max(map(len, indents))
+
+
 def compute_documentation_ratio(code: str, lang: str) -> float:
     """
     Compute ratio of documentation to code
     """
-    lines = code.splitlines()
-    doc_lines = 0
-    code_lines = 0
-    
-    for line in lines:
-        stripped = line.strip()
-        if not stripped:
-            continue
-        
-        code_lines += 1
-        
-        # Check for comments
-        if lang in ['py', 'python']:
-            if stripped.startswith('#') or stripped.startswith('"""') or stripped.startswith("'''"):
-                doc_lines += 1
-        elif lang in ['js', 'javascript', 'typescript', 'go', 'rust', 'java', 'c', 'cpp']:
-            if stripped.startswith('//') or stripped.startswith('/*') or stripped.startswith('*'):
-                doc_lines += 1
-        elif lang in ['ruby']:
-            if stripped.startswith('#'):
-                doc_lines += 1
-        elif lang in ['php']:
-            if stripped.startswith('//') or stripped.startswith('#') or stripped.startswith('/*'):
-                doc_lines += 1
-    
+    code_lines, doc_lines, _ = _scan_lines(code, lang)
     return doc_lines / code_lines if code_lines > 0 else 0.0
 
 
@@ -79,13 +197,23 @@ def assess_quality_enhanced(code: str, lang: str, fragment_type: str) -> Tuple[i
     Enhanced quality assessment with detailed metrics
     Returns: (quality_score 1-10, metrics_dict)
     """
-    lines = code.splitlines()
-    text = code.lower()
+    score, metrics = _assess_quality_cached(code, lang, fragment_type)
+    return score, dict(metrics)
+
+
+@functools.lru_cache(maxsize=4096)
+def _assess_quality_cached(code: str, lang: str, fragment_type: str) -> Tuple[int, Dict[str, any]]:
+    """
+    Score a fragment, memoized so identical blocks (vendored or copied files)
+    are only scored once per process
+    """
+    found = _find_quality_markers(code.lower())
     score = 5  # Start neutral
     metrics = {}
     
-    # Line count scoring
-    line_count = len([l for l in lines if l.strip()])
+    # Line count scoring (the same pass also yields the documentation ratio
+    # and nesting depth)
+    line_count, doc_lines, max_indent = _scan_lines(code, lang)
     metrics['line_count'] = line_count
     
     if 10 <= line_count <= 50:
@@ -101,7 +229,7 @@ def assess_quality_enhanced(code: str, lang: str, fragment_type: str) -> Tuple[i
         metrics['length_score'] = 0
     
     # Documentation ratio
-    doc_ratio = compute_documentation_ratio(code, lang)
+    doc_ratio = doc_lines / line_count if line_count > 0 else 0.0
     metrics['doc_ratio'] = doc_ratio
     
     if doc_ratio > 0.15:
@@ -118,44 +246,43 @@ def assess_quality_enhanced(code: str, lang: str, fragment_type: str) -> Tuple[i
     
     # TypeScript/typed code
     if lang in ['typescript', 'ts']:
-        has_types = ': ' in code or 'interface' in text or 'type ' in text
+        has_types = ': ' in code or 'interface' in found or 'type ' in found
         metrics['has_types'] = has_types
         if has_types:
             score += 1
     
     # Async patterns
-    if 'async' in text or 'await' in text:
+    if 'async' in found or 'await' in found:
         score += 1
         metrics['has_async'] = True
     
     # Error handling
-    has_error_handling = any(kw in text for kw in ['try', 'catch', 'except', 'error', 'throw'])
+    has_error_handling = not _ERROR_MARKERS.isdisjoint(found)
     metrics['has_error_handling'] = has_error_handling
     if has_error_handling:
         score += 1
     
     # Export declarations (good for reusability)
-    if 'export' in text:
+    if 'export' in found:
         score += 1
         metrics['has_exports'] = True
     
     # Negative factors
     
     # TODO/FIXME markers
-    has_todos = 'todo' in text or 'fixme' in text or 'hack' in text
+    has_todos = not _TODO_MARKERS.isdisjoint(found)
     metrics['has_todos'] = has_todos
     if has_todos:
         score -= 1
     
     # Debug statements
-    debug_patterns = ['console.log', 'print(', 'println', 'fmt.println', 'debugger']
-    has_debug = any(pat in text for pat in debug_patterns)
+    has_debug = not _DEBUG_MARKERS.isdisjoint(found)
     metrics['has_debug'] = has_debug
     if has_debug:
         score -= 1
     
     # Tests (depending on context, might be positive or filtered separately)
-    is_test = 'test' in text or 'spec' in text or 'describe' in text
+    is_test = not _TEST_MARKERS.isdisjoint(found)
     metrics['is_test'] = is_test
     if is_test and 'test' in fragment_type.lower():
         score += 1  # Good if we're looking for tests
@@ -172,12 +299,6 @@ def assess_quality_enhanced(code: str, lang: str, fragment_type: str) -> Tuple[i
         score += 1
     
     # Nesting depth
-    max_indent = 0
-    for line in lines:
-        if line.strip():
-            indent = len(line) - len(line.lstrip())
-            max_indent = max(max_indent, indent)
-    
     metrics['max_indent'] = max_indent
     if max_indent > 24:
         score -= 2
@@ -195,6 +316,50 @@ def assess_quality_enhanced(code: str, lang: str, fragment_type: str) -> Tuple[i
     return final_score, metrics
 
 
+_PY_DEF_TYPES = (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)
+_PY_FUNC_TYPES = (ast.FunctionDef, ast.AsyncFunctionDef)
+# Statement-list fields, in the order ast.iter_child_nodes() visits them
+_PY_BLOCK_FIELDS = ('body', 'handlers', 'orelse', 'finalbody', 'cases')
+
+
+def _collect_python_defs(tree: ast.AST, include_nested: bool = True) -> List[Tuple[ast.AST, List[str]]]:
+    """
+    Find function/class definitions and the modules each one imports
+
+    A single breadth-first pass in ast.walk() order. Only statement blocks
+    are descended into, since expressions hold no definitions or imports.
+    With include_nested=False, definitions inside function bodies are not
+    reported, though their imports still count for the enclosing function.
+    Returns: [(def_node, imports)] with imports from nested scopes included
+    """
+    defs = []
+    queue = deque([(tree, (), False)])
+    
+    while queue:
+        node, owners, in_function = queue.popleft()
+        
+        if isinstance(node, _PY_DEF_TYPES):
+            if include_nested or not in_function:
+                imports = []
+                defs.append((node, imports))
+                owners = owners + (imports,)
+            in_function = in_function or isinstance(node, _PY_FUNC_TYPES)
+        elif owners and isinstance(node, ast.Import):
+            names = [alias.name for alias in node.names]
+            for imports in owners:
+                imports.extend(names)
+        elif owners and isinstance(node, ast.ImportFrom) and node.module:
+            for imports in owners:
+                imports.append(node.module)
+        
+        for name in _PY_BLOCK_FIELDS:
+            block = getattr(node, name, None)
+            if block:
+                queue.extend((child, owners, in_function) for child in block)
+    
+    return defs
+
+
 def extract_python_fragments(code: str, file_path: Path, project_name: str, config: Config) -> List[Fragment]:
     """Extract Python functions and classes using AST"""
     fragments = []
@@ -203,66 +368,56 @@ def extract_python_fragments(code: str, file_path: Path, project_name: str, conf
         tree = ast.parse(code)
         lines = code.splitlines()
         
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.ClassDef, ast.AsyncFunctionDef)):
-                # Get block
-                start = getattr(node, "lineno", 1) - 1
-                end = getattr(node, "end_lineno", start + 1)
+        for node, imports in _collect_python_defs(tree, config.include_nested):
+            # Get block
+            start = getattr(node, "lineno", 1) - 1
+            end = getattr(node, "end_lineno", start + 1)
+            
+            if 0 <= start < len(lines) and end <= len(lines):
+                block_lines = lines[start:end]
+                block = "\n".join(block_lines)
+                
+                # Skip if too short or too long
+                if len(block_lines) < config.min_lines or len(block_lines) > config.max_lines:
+                    continue
+                
+                # Determine type
+                if isinstance(node, ast.ClassDef):
+                    frag_type = "PythonClass"
+                elif isinstance(node, ast.AsyncFunctionDef):
+                    frag_type = "PythonAsyncFunc"
+                else:
+                    frag_type = "PythonFunc"
+                
+                # Quality assessment
+                quality, metrics = assess_quality_enhanced(block, 'python', frag_type)
                 
-                if 0 <= start < len(lines) and end <= len(lines):
-                    block_lines = lines[start:end]
-                    block = "\n".join(block_lines)
-                    
-                    # Skip if too short or too long
-                    if len(block_lines) < config.min_lines or len(block_lines) > config.max_lines:
-                        continue
-                    
-                    # Determine type
-                    if isinstance(node, ast.ClassDef):
-                        frag_type = "PythonClass"
-                    elif isinstance(node, ast.AsyncFunctionDef):
-                        frag_type = "PythonAsyncFunc"
-                    else:
-                        frag_type = "PythonFunc"
-                    
-                    # Extract imports (simple approach)
-                    imports = []
-                    for imp_node in ast.walk(node):
-                        if isinstance(imp_node, ast.Import):
-                            imports.extend([alias.name for alias in imp_node.names])
-                        elif isinstance(imp_node, ast.ImportFrom):
-                            if imp_node.module:
-                                imports.append(imp_node.module)
-                    
-                    # Quality assessment
-                    quality, metrics = assess_quality_enhanced(block, 'python', frag_type)
-                    
-                    # Skip low quality if configured
-                    if quality < config.min_quality:
-                        continue
-                    
-                    uid = stable_uid(project_name, file_path.name, str(start))
-                    
-                    fragment = Fragment(
-                        uid=uid,
-                        name=node.name,
-                        type=frag_type,
-                        file=str(file_path),
-                        project=project_name,
-                        code=block,
-                        lines=len(block_lines),
-                        quality=quality,
-                        start_line=start + 1,
-                        end_line=end,
-                        imports=imports,
-                        complexity=metrics.get('complexity', 0),
-                        documentation_ratio=metrics.get('doc_ratio', 0.0),
-                        has_types=metrics.get('has_types', False),
-                        has_error_handling=metrics.get('has_error_handling', False),
-                        has_tests=metrics.get('is_test', False)
-                    )
-                    
-                    fragments.append(fragment)
+                # Skip low quality if configured
+                if quality < config.min_quality:
+                    continue
+                
+                uid = stable_uid(project_name, file_path.name, str(start))
+                
+                fragment = Fragment(
+                    uid=uid,
+                    name=node.name,
+                    type=frag_type,
+                    file=str(file_path),
+                    project=project_name,
+                    code=block,
+                    lines=len(block_lines),
+                    quality=quality,
+                    start_line=start + 1,
+                    end_line=end,
+                    imports=imports,
+                    complexity=metrics.get('complexity', 0),
+                    documentation_ratio=metrics.get('doc_ratio', 0.0),
+                    has_types=metrics.get('has_types', False),
+                    has_error_handling=metrics.get('has_error_handling', False),
+                    has_tests=metrics.get('is_test', False)
+                )
+                
+                fragments.append(fragment)
     
     except SyntaxError as e:
         logger.warning(f"Syntax error in {file_path}: {e}")
@@ -278,36 +433,22 @@ def extract_js_block(lines: List[str], start_line: int) -> Tuple[str, int]:
         return "", start_line
     
     line = lines[start_line]
-    brace = 0
-    seen_open = False
-    
-    for ch in line:
-        if ch == "{":
-            brace += 1
-            seen_open = True
-        elif ch == "}":
-            brace -= 1
-    
-    if not seen_open:
+    if "{" not in line:
         return line, start_line
     
-    block = [line]
+    # Braces are only compared at line ends, so count them per line in C
+    brace = line.count("{") - line.count("}")
     end_line = start_line
     
     for i in range(start_line + 1, min(len(lines), start_line + 500)):  # Limit search
         end_line = i
-        block.append(lines[i])
-        
-        for ch in lines[i]:
-            if ch == "{":
-                brace += 1
-            elif ch == "}":
-                brace -= 1
+        line = lines[i]
+        brace += line.count("{") - line.count("}")
         
         if brace <= 0:
             break
     
-    return "\n".join(block), end_line
+    return "\n".join(lines[start_line:end_line + 1]), end_line
 
 
 def extract_js_fragments(code: str, file_path: Path, project_name: str, config: Config) -> List[Fragment]:
@@ -315,179 +456,314 @@ def extract_js_fragments(code: str, file_path: Path, project_name: str, config:
     fragments = []
     lines = code.splitlines()
     
-    patterns = [
-        (r"(?:export\s+)?(?:async\s+)?function\s+(\w+)", "Function"),
-        (r"(?:export\s+)?class\s+(\w+)", "Class"),
-        (r"const\s+(\w+)\s*=\s*(?:async\s*)?\([^)]*\)\s*=>", "ArrowFunc"),
-        (r"(?:export\s+)?(?:const|let|var)\s+(\w+)\s*=\s*\([^)]*\)\s*=>", "Component"),
-    ]
-    
-    for pattern, frag_type in patterns:
-        for match in re.finditer(pattern, code):
-            name = match.group(1)
-            start_line = code[:match.start()].count("\n")
-            
-            block, end_line = extract_js_block(lines, start_line)
-            
-            # Skip if too short or too long
-            block_lines = block.splitlines()
-            if len(block_lines) < config.min_lines or len(block_lines) > config.max_lines:
-                continue
-            
-            # Quality assessment
-            quality, metrics = assess_quality_enhanced(block, 'javascript', frag_type)
-            
-            if quality < config.min_quality:
-                continue
-            
-            # Extract imports
-            imports = re.findall(r'import\s+.*?from\s+[\'"]([^\'"]+)[\'"]', block)
-            
-            # Check for exports
-            exports = []
-            if 'export' in block:
-                exports.append(name)
-            
-            uid = stable_uid(project_name, file_path.name, str(start_line))
-            
-            fragment = Fragment(
-                uid=uid,
-                name=name,
-                type=f"JS/{frag_type}",
-                file=str(file_path),
-                project=project_name,
-                code=block,
-                lines=len(block_lines),
-                quality=quality,
-                start_line=start_line + 1,
-                end_line=end_line + 1,
-                imports=imports,
-                exports=exports,
-                complexity=metrics.get('complexity', 0),
-                documentation_ratio=metrics.get('doc_ratio', 0.0),
-                has_types=metrics.get('has_types', False),
-                has_error_handling=metrics.get('has_error_handling', False)
-            )
-            
-            fragments.append(fragment)
+    # Matches arrive in source order, so line numbers are counted
+    # incrementally from the previous match rather than from the file start
+    candidates = []
+    start_line = 0
+    counted_to = 0
+    for match in _JS_DEFINITION_RE.finditer(code):
+        start_line += code.count("\n", counted_to, match.start())
+        counted_to = match.start()
+        # lastindex is the group of the alternative that matched
+        candidates.append((match.lastindex - 1, start_line, match.group(match.lastindex)))
+    
+    # Emit in pattern order (stable, so source order within a pattern), as
+    # one pass per pattern did. Definitions sharing a line share a block,
+    # and deduplication keeps the first, so this order decides its type.
+    candidates.sort(key=itemgetter(0))
+    
+    for type_index, start_line, name in candidates:
+        frag_type = _JS_DEFINITION_TYPES[type_index]
+        block, end_line = extract_js_block(lines, start_line)
+        
+        # Skip if too short or too long
+        block_lines = block.splitlines()
+        if len(block_lines) < config.min_lines or len(block_lines) > config.max_lines:
+            continue
+        
+        # Quality assessment
+        quality, metrics = assess_quality_enhanced(block, 'javascript', frag_type)
+        
+        if quality < config.min_quality:
+            continue
+        
+        # Extract imports
+        imports = _JS_IMPORT_RE.findall(block)
+        
+        # Check for exports
+        exports = []
+        if 'export' in block:
+            exports.append(name)
+        
+        uid = stable_uid(project_name, file_path.name, str(start_line))
+        
+        fragment = Fragment(
+            uid=uid,
+            name=name,
+            type=f"JS/{frag_type}",
+            file=str(file_path),
+            project=project_name,
+            code=block,
+            lines=len(block_lines),
+            quality=quality,
+            start_line=start_line + 1,
+            end_line=end_line + 1,
+            imports=imports,
+            exports=exports,
+            complexity=metrics.get('complexity', 0),
+            documentation_ratio=metrics.get('doc_ratio', 0.0),
+            has_types=metrics.get('has_types', False),
+            has_error_handling=metrics.get('has_error_handling', False)
+        )
+        
+        fragments.append(fragment)
     
     return fragments
 
 
 def extract_from_file(file_path: Path, project: Project, config: Config) -> List[Fragment]:
     """Extract fragments from a single file"""
+    return _extract_file_job(str(file_path), project.name, config)[0]
+
+
+# Extractor per file suffix, with byte strings of which every extractable
+# file must contain at least one (a keyword each fragment pattern needs)
+_PY_SNIFF = (b'def', b'class')
+_JS_SNIFF = (b'function', b'class', b'=>')
+_EXTRACTORS = {
+    '.py': (extract_python_fragments, _PY_SNIFF),
+    **{suffix: (extract_js_fragments, _JS_SNIFF) for suffix in ('.js', '.jsx', '.ts', '.tsx')},
+    # Add more languages as needed (Go, Rust, Java, etc.)
+}
+
+
+def _extract_file_job(file_path: str, project_name: str,
+                      config: Config) -> Tuple[List[Fragment], Optional[str]]:
+    """
+    Worker entry point for extract_from_file
+
+    Top-level and taking only plain values so it pickles cheaply for
+    ProcessPoolExecutor (no Project with its set of languages). Also returns
+    the content hash of the file when it was read, so the incremental cache
+    never has to read new files itself.
+    """
+    path = Path(file_path)
+    extractor = _EXTRACTORS.get(path.suffix)
+    if extractor is None:
+        return [], None
+    extract, sniff = extractor
+    
     try:
-        code = safe_read_text(file_path)
-        if not code:
-            return []
+        if os.stat(file_path).st_size > config.max_file_mb * 1024 * 1024:
+            logger.debug(f"Skipping large file: {path}")
+            return [], None
         
-        # Determine language and extract
-        if file_path.suffix == '.py':
-            return extract_python_fragments(code, file_path, project.name, config)
-        elif file_path.suffix in ['.js', '.jsx', '.ts', '.tsx']:
-            return extract_js_fragments(code, file_path, project.name, config)
-        # Add more languages as needed (Go, Rust, Java, etc.)
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        digest = content_hash(data)
         
-        return []
+        # Skip decoding and parsing files that cannot hold a fragment
+        if not any(marker in data for marker in sniff):
+            return [], digest
+        
+        code = decode_text(data)
+        if not code:
+            return [], digest
+        
+        return extract(code, path, project_name, config), digest
     
     except Exception as e:
-        logger.error(f"Error extracting from {file_path}: {e}")
-        return []
+        logger.error(f"Error extracting from {path}: {e}")
+        return [], None
+
+
+def _is_duplicate(frag: Fragment, seen: Dict[str, Fragment]) -> bool:
+    """
+    Check a fragment against those kept so far, recording it if it is new
+    """
+    # Identical code always has the same semantic hash, so a single lookup
+    # catches exact and semantic duplicates alike
+    semantic_hash = frag.compute_embedding_hash()
+    kept = seen.get(semantic_hash)
+    
+    if kept is None:
+        seen[semantic_hash] = frag
+        return False
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        kind = "exact" if kept.code_hash == frag.code_hash else "semantic"
+        logger.debug(f"Skipping {kind} duplicate: {frag.name}")
+    return True
 
 
 def deduplicate_fragments(fragments: List[Fragment]) -> List[Fragment]:
     """
     Remove duplicate fragments using both exact and semantic matching
     """
-    seen_exact = set()
-    seen_semantic = set()
-    unique = []
-    
-    for frag in fragments:
-        # Check exact match
-        if frag.code_hash in seen_exact:
-            logger.debug(f"Skipping exact duplicate: {frag.name}")
-            continue
-        
-        # Compute semantic hash
-        semantic_hash = frag.compute_embedding_hash()
-        
-        # Check semantic similarity (simple version)
-        if semantic_hash in seen_semantic:
-            logger.debug(f"Skipping semantic duplicate: {frag.name}")
-            continue
-        
-        seen_exact.add(frag.code_hash)
-        seen_semantic.add(semantic_hash)
-        unique.append(frag)
+    seen: Dict[str, Fragment] = {}
+    unique = [frag for frag in fragments if not _is_duplicate(frag, seen)]
     
     logger.info(f"Deduplicated: {len(fragments)} -> {len(unique)} fragments")
     return unique
 
 
-def extract_fragments_parallel(projects: List[Project], config: Config) -> List[Fragment]:
+# Extraction pool of the run in progress; also shut down at interpreter exit
+# in case a run is abandoned midway
+_EXECUTOR: Optional[ProcessPoolExecutor] = None
+
+# Worker start-up only pays off with a few files for each worker
+_MIN_FILES_PER_WORKER = 4
+
+
+def _mp_context():
+    """
+    Pick the start method for the extraction pool
+
+    fork needs no __main__ guard in the calling script, but forking while
+    other threads are alive (such as the scanner's pool) can deadlock the
+    child, so forkserver or spawn is used then.
+    """
+    methods = multiprocessing.get_all_start_methods()
+    if "fork" in methods and threading.active_count() == 1:
+        return multiprocessing.get_context("fork")
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+def _in_child_process() -> bool:
+    """
+    Whether this is a multiprocessing child, including one that is still
+    importing an unguarded __main__ (where starting processes fails)
+    """
+    return (multiprocessing.parent_process() is not None
+            or getattr(multiprocessing.current_process(), '_inheriting', False))
+
+
+def _start_executor(max_workers: int) -> ProcessPoolExecutor:
+    """Start the extraction pool for one run"""
+    global _EXECUTOR
+    _shutdown_executor()
+    _EXECUTOR = ProcessPoolExecutor(max_workers=max_workers, mp_context=_mp_context())
+    return _EXECUTOR
+
+
+def _shutdown_executor():
+    """Shut down the extraction pool, if one was started"""
+    global _EXECUTOR
+    if _EXECUTOR is not None:
+        _EXECUTOR.shutdown()
+        _EXECUTOR = None
+
+
+atexit.register(_shutdown_executor)
+
+
+def _run_extraction(jobs: List[Tuple[Path, Project]], config: Config,
+                    cache: Optional[IncrementalCache]) -> Iterator[List[Fragment]]:
+    """
+    Extract the given files, yielding each file's fragments as they arrive
+
+    Files are extracted in a process pool, started for this run only, when
+    there are enough of them. A child process never starts a pool of its own.
+    """
+    workers = min(config.max_workers, len(jobs) // _MIN_FILES_PER_WORKER)
+    if config.parallel_scan and len(jobs) > 10 and workers > 1 and not _in_child_process():
+        # Parallel extraction: parsing and scoring are CPU-bound pure Python,
+        # so use processes to get past the GIL
+        chunksize = max(1, len(jobs) // (workers * 4))
+        done = 0
+        try:
+            results = _start_executor(workers).map(
+                _extract_file_job,
+                [str(file_path) for file_path, _ in jobs],
+                [project.name for _, project in jobs],
+                repeat(config),
+                chunksize=chunksize,
+            )
+            for (file_path, _), (fragments, digest) in zip(jobs, results):
+                if cache is not None:
+                    cache.store(file_path, fragments, digest)
+                done += 1
+                yield fragments
+            return
+        except Exception as e:
+            # Includes a pool that could not start its workers (RuntimeError,
+            # BrokenProcessPool) as well as one whose worker crashed
+            logger.error(f"Extraction pool failed, continuing sequentially: {e}")
+            # Finish the files not yet yielded, so a pool failure costs only speed
+            jobs = jobs[done:]
+        finally:
+            _shutdown_executor()
+    
+    # Sequential extraction
+    for file_path, project in jobs:
+        fragments, digest = _extract_file_job(str(file_path), project.name, config)
+        if cache is not None:
+            cache.store(file_path, fragments, digest)
+        yield fragments
+
+
+def extract_fragments_parallel(projects: List[Project], config: Config, use_cache: bool = True) -> List[Fragment]:
     """
     Extract fragments from projects using parallel processing
     """
-    all_fragments = []
-    total_files = sum(len(p.code_files) for p in projects)
-    
-    logger.info(f"Extracting fragments from {total_files} files across {len(projects)} projects")
-    
-    if config.parallel_scan and total_files > 10:
-        # Parallel extraction
-        with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
-            futures = []
-            for project in projects:
-                for file_path in project.code_files:
-                    future = executor.submit(extract_from_file, Path(file_path), project, config)
-                    futures.append(future)
-            
-            for future in as_completed(futures):
-                try:
-                    fragments = future.result()
-                    all_fragments.extend(fragments)
-                except Exception as e:
-                    logger.error(f"Extraction error: {e}")
-    else:
-        # Sequential extraction
-        for project in projects:
-            for file_path in project.code_files:
-                fragments = extract_from_file(Path(file_path), project, config)
-                all_fragments.extend(fragments)
+    jobs = [(Path(file_path), project) for project in projects for file_path in project.code_files]
     
-    logger.info(f"Extracted {len(all_fragments)} raw fragments")
+    logger.info(f"Extracting fragments from {len(jobs)} files across {len(projects)} projects")
     
-    # Deduplicate if configured
-    if config.deduplicate:
-        all_fragments = deduplicate_fragments(all_fragments)
+    # Reuse fragments of files that have not changed since the last run
+    cache = None
+    cached_fragments = []
+    if use_cache and config.enable_cache:
+        cache = IncrementalCache.load(config)
+        cached_fragments, jobs = cache.partition(jobs)
     
-    # Filter tests if configured
+    # Deduplicate and filter tests as each file's fragments arrive, so
+    # rejected fragments are dropped at once instead of being collected into
+    # an intermediate list that is then copied by each pass
+    seen: Dict[str, Fragment] = {}
+    all_fragments = []
+    raw_count = duplicates = tests = 0
+    
+    for fragments in chain([cached_fragments], _run_extraction(jobs, config, cache)):
+        raw_count += len(fragments)
+        for frag in fragments:
+            if config.deduplicate and _is_duplicate(frag, seen):
+                duplicates += 1
+            elif config.skip_tests and frag.has_tests:
+                tests += 1
+            else:
+                all_fragments.append(frag)
+    
+    if cache is not None:
+        cache.save()
+    
+    logger.info(f"Extracted {raw_count} raw fragments")
+    if config.deduplicate:
+        logger.info(f"Deduplicated: {raw_count} -> {raw_count - duplicates} fragments")
     if config.skip_tests:
-        original_count = len(all_fragments)
-        all_fragments = [f for f in all_fragments if not f.has_tests]
-        logger.info(f"Filtered out {original_count - len(all_fragments)} test fragments")
+        logger.info(f"Filtered out {tests} test fragments")
     
     return all_fragments
 
 
-def extract_fragments(projects: List[Project], config: Config) -> ExtractionResult:
+def extract_fragments(projects: List[Project], config: Config, use_cache: bool = True) -> ExtractionResult:
     """
-    Main entry point for fragment extraction
+    Main entry point for fragment extraction with optional incremental caching
     """
     start_time = time.time()
     
-    fragments = extract_fragments_parallel(projects, config)
+    fragments = extract_fragments_parallel(projects, config, use_cache=use_cache)
     
-    # Sort by quality (highest first)
-    fragments.sort(key=lambda f: (f.quality, f.lines), reverse=True)
+    # Sort by quality (highest first); attrgetter builds the key tuples in C
+    fragments.sort(key=attrgetter('quality', 'lines'), reverse=True)
     
     extraction_time = time.time() - start_time
-    
-    logger.info(f"Extraction complete: {len(fragments)} fragments in {extraction_time:.2f}s")
-    logger.info(f"Average quality: {sum(f.quality for f in fragments) / len(fragments):.1f}" if fragments else "N/A")
-    
-    return ExtractionResult(
+    result = ExtractionResult(
         fragments=fragments,
         extraction_time=extraction_time
     )
+    
+    logger.info(f"Extraction complete: {len(fragments)} fragments in {extraction_time:.2f}s")
+    logger.info(f"Average quality: {result.avg_quality:.1f}" if fragments else "N/A")
+    
+    return result
@@ -0,0 +1,171 @@
+"""Incremental per-file cache of extracted fragments"""
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from . import __version__
+from .config import Config, get_cache_path, dump_cache, load_cache
+from .models import Fragment, Project
+from .utils import content_hash
+
+logger = logging.getLogger(__name__)
+
+INDEX_CACHE_KEY = "fragment_index"
+MAX_ENTRIES = 2000
+
+# Entry layout: [mtime_ns, size, content_digest, stored_at, project_name, fragment_dicts]
+_MTIME, _SIZE, _DIGEST, _STORED_AT, _PROJECT, _FRAGMENTS = range(6)
+_LAYOUT_VERSION = 2
+
+
+def config_fingerprint(config: Config) -> str:
+    """
+    Fingerprint the settings that change per-file extraction results
+
+    Post-extraction filters (deduplicate, skip_tests) are applied after the
+    cache and so are deliberately left out.
+    """
+    key = (f"{__version__}:{_LAYOUT_VERSION}:{config.min_quality}:{config.min_lines}:{config.max_lines}:"
+           f"{config.include_nested}:{config.max_file_mb}")
+    return content_hash(key.encode())
+
+
+class IncrementalCache:
+    """
+    Two-tier cache mapping source files to the fragments extracted from them
+
+    A file whose (mtime, size) is unchanged is a hit without being read.
+    Otherwise its content hash is compared, so touched-but-identical files
+    are still hits; only genuinely changed files are re-extracted. Entries
+    also record the project the fragments were extracted for, since each
+    fragment carries its project's name.
+    """
+
+    def __init__(self, config: Config):
+        self.path = get_cache_path(INDEX_CACHE_KEY, config.cache_format)
+        self.key = config_fingerprint(config)
+        self.ttl_seconds = config.cache_ttl_hours * 3600
+        self.entries: Dict[str, list] = {}
+        self._pending: Dict[str, Tuple[int, int, str]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, config: Config) -> 'IncrementalCache':
+        """Load the index from disk, dropping it if the config changed"""
+        cache = cls(config)
+        try:
+            data = load_cache(cache.path)
+        except FileNotFoundError:
+            return cache
+        except Exception as e:
+            logger.warning("Error loading fragment cache: %s", e)
+            return cache
+
+        if data.get('key') != cache.key:
+            logger.info("Extraction settings changed, discarding fragment cache")
+            cache._dirty = True
+            return cache
+
+        cutoff = time.time() - cache.ttl_seconds
+        for path, entry in data.get('entries', {}).items():
+            if entry[_STORED_AT] >= cutoff:
+                cache.entries[path] = entry
+            else:
+                cache._dirty = True
+        return cache
+
+    def lookup(self, path: str, st: os.stat_result, project_name: str) -> Optional[List[Dict[str, Any]]]:
+        """Fast path: return cached fragment dicts if project, mtime and size match"""
+        entry = self.entries.get(path)
+        if (entry and entry[_PROJECT] == project_name
+                and entry[_MTIME] == st.st_mtime_ns and entry[_SIZE] == st.st_size):
+            return entry[_FRAGMENTS]
+        return None
+
+    def partition(self, jobs: List[Tuple[Path, Project]]) -> Tuple[List[Fragment], List[Tuple[Path, Project]]]:
+        """
+        Split extraction jobs into cached fragments and jobs still to run
+        """
+        fragments = []
+        stale = []
+        stats = {}
+        hits = 0
+
+        for file_path, project in jobs:
+            key = str(file_path)
+            try:
+                st = os.stat(key)
+            except OSError:
+                continue
+            cached = self.lookup(key, st, project.name)
+            if cached is not None:
+                hits += 1
+                fragments.extend(Fragment.from_dict(dict(d)) for d in cached)
+            else:
+                stats[key] = st
+                stale.append((file_path, project))
+
+        # Slow path: compare content hashes of files whose stat changed. Files
+        # are read one at a time and only when the same project has an entry
+        # to compare against; new files are hashed by the extraction worker
+        remaining = []
+        for file_path, project in stale:
+            key = str(file_path)
+            st = stats[key]
+            entry = self.entries.get(key)
+            self._pending[key] = (st.st_mtime_ns, st.st_size, project.name)
+            if not entry or entry[_PROJECT] != project.name:
+                remaining.append((file_path, project))
+                continue
+            try:
+                with open(key, 'rb') as f:
+                    digest = content_hash(f.read())
+            except OSError:
+                remaining.append((file_path, project))
+                continue
+
+            if entry[_DIGEST] == digest:
+                del self._pending[key]
+                entry[_MTIME], entry[_SIZE] = st.st_mtime_ns, st.st_size
+                self._dirty = True
+                hits += 1
+                fragments.extend(Fragment.from_dict(dict(d)) for d in entry[_FRAGMENTS])
+            else:
+                remaining.append((file_path, project))
+
+        logger.info("Fragment cache: %s hits, %s misses", hits, len(remaining))
+        return fragments, remaining
+
+    def store(self, file_path: Path, fragments: List[Fragment], digest: Optional[str]):
+        """
+        Record freshly extracted fragments for a file seen by partition()
+
+        digest is the content hash of the bytes the fragments were extracted
+        from. None means the file was not read (an error, or too large), so
+        nothing is recorded and the file is retried on the next run.
+        """
+        key = str(file_path)
+        meta = self._pending.pop(key, None)
+        if meta is None or digest is None:
+            return
+        mtime_ns, size, project_name = meta
+        self.entries[key] = [mtime_ns, size, digest, time.time(), project_name,
+                             [f.to_dict() for f in fragments]]
+        self._dirty = True
+
+    def save(self):
+        """Persist the index, evicting the oldest entries beyond MAX_ENTRIES"""
+        if not self._dirty:
+            return
+
+        if len(self.entries) > MAX_ENTRIES:
+            newest = sorted(self.entries.items(), key=lambda item: item[1][_STORED_AT], reverse=True)
+            self.entries = dict(newest[:MAX_ENTRIES])
+
+        try:
+            dump_cache({'key': self.key, 'entries': self.entries}, self.path)
+            self._dirty = False
+        except Exception as e:
+            logger.warning("Error saving fragment cache: %s", e)
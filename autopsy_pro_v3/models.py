@@ -1,12 +1,23 @@
 """Enhanced data models with rich metadata and serialization"""
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional, Set
 from datetime import datetime
+from heapq import nsmallest
+from operator import attrgetter
 from pathlib import Path
-import hashlib
+import re
+import sys
 
+from .utils import content_hash
 
-@dataclass
+# Slotted instances are smaller and have faster attribute access (3.10+)
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+# Runs of alphanumeric characters (str.isalnum), i.e. word characters minus '_'
+_WORD_RE = re.compile(r'[^\W_]+')
+
+
+@dataclass(**_SLOTS)
 class Project:
     """Project metadata"""
     name: str
@@ -41,9 +52,21 @@ class Project:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        data = asdict(self)
-        data['languages'] = list(self.languages)  # Convert set to list
-        return data
+        # Built directly: asdict() deep-copies recursively and is much slower
+        return {
+            'name': self.name,
+            'path': self.path,
+            'type': self.type,
+            'files': self.files,
+            'size_bytes': self.size_bytes,
+            'last_modified': self.last_modified,
+            'code_files': list(self.code_files),
+            'dependencies': list(self.dependencies),
+            'frameworks': list(self.frameworks),
+            'languages': list(self.languages),  # Convert set to list
+            'complexity_score': self.complexity_score,
+            'health_score': self.health_score
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Project':
@@ -53,7 +76,7 @@ class Project:
         return cls(**data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Fragment:
     """Code fragment with enhanced metadata"""
     uid: str
@@ -82,6 +105,9 @@ class Fragment:
     embedding_hash: Optional[str] = None
     similar_fragments: List[str] = field(default_factory=list)
     
+    # Lazily computed by code_hash; not serialized
+    _code_hash: Optional[str] = field(default=None, repr=False, compare=False)
+    
     @property
     def file_name(self) -> str:
         """Just the filename"""
@@ -111,23 +137,46 @@ class Fragment:
     
     @property
     def code_hash(self) -> str:
-        """Hash of the code for comparison"""
-        return hashlib.md5(self.code.encode()).hexdigest()
+        """Hash of the code for comparison, computed once per fragment"""
+        if self._code_hash is None:
+            self._code_hash = content_hash(self.code.encode())
+        return self._code_hash
     
     def compute_embedding_hash(self) -> str:
         """Compute a simple semantic hash (would use embeddings in production)"""
         # Normalize code for semantic comparison
-        normalized = self.code.lower()
-        normalized = ''.join(c if c.isalnum() else ' ' for c in normalized)
-        words = normalized.split()
-        word_set = sorted(set(words))
-        semantic_text = ' '.join(word_set[:50])  # First 50 unique words
-        self.embedding_hash = hashlib.md5(semantic_text.encode()).hexdigest()
+        words = _WORD_RE.findall(self.code.lower())
+        word_set = nsmallest(50, set(words))  # First 50 unique words
+        semantic_text = ' '.join(word_set)
+        self.embedding_hash = content_hash(semantic_text.encode())
         return self.embedding_hash
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        return asdict(self)
+        # Built directly: asdict() deep-copies recursively and is much slower
+        return {
+            'uid': self.uid,
+            'name': self.name,
+            'type': self.type,
+            'file': self.file,
+            'project': self.project,
+            'code': self.code,
+            'lines': self.lines,
+            'quality': self.quality,
+            'start_line': self.start_line,
+            'end_line': self.end_line,
+            'dependencies': list(self.dependencies),
+            'imports': list(self.imports),
+            'exports': list(self.exports),
+            'complexity': self.complexity,
+            'documentation_ratio': self.documentation_ratio,
+            'has_types': self.has_types,
+            'has_tests': self.has_tests,
+            'has_error_handling': self.has_error_handling,
+            'tags': list(self.tags),
+            'embedding_hash': self.embedding_hash,
+            'similar_fragments': list(self.similar_fragments)
+        }
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Fragment':
@@ -135,7 +184,7 @@ class Fragment:
         return cls(**data)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ScanResult:
     """Result of a project scan"""
     base_path: str
@@ -175,7 +224,7 @@ class ScanResult:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class ExtractionResult:
     """Result of fragment extraction"""
     fragments: List[Fragment]
@@ -184,17 +233,17 @@ class ExtractionResult:
     
     @property
     def total_lines(self) -> int:
-        return sum(f.lines for f in self.fragments)
+        return sum(map(attrgetter('lines'), self.fragments))
     
     @property
     def avg_quality(self) -> float:
         if not self.fragments:
             return 0.0
-        return sum(f.quality for f in self.fragments) / len(self.fragments)
+        return sum(map(attrgetter('quality'), self.fragments)) / len(self.fragments)
     
     @property
     def languages(self) -> Set[str]:
-        return {f.language for f in self.fragments}
+        return set(map(attrgetter('language'), self.fragments))
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -214,7 +263,7 @@ class ExtractionResult:
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class BuildResult:
     """Result of project build"""
     success: bool
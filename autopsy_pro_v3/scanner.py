@@ -1,15 +1,22 @@
 """Enhanced project scanner with parallel processing, caching, and better detection"""
 import os
-import json
 import time
+import atexit
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Set, Dict, Tuple, Optional
+from typing import Any, List, Set, Dict, Tuple, Optional, Iterator, Union
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
 from .models import Project, ScanResult
-from .config import Config, get_cache_path
+from .config import Config, get_cache_path, dump_cache, load_cache
+from .utils import content_hash, dumps_json, loads_json
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
 
 logger = logging.getLogger(__name__)
 
@@ -44,6 +51,74 @@ PROJECT_INDICATORS = {
     "app.config.ts": ("React Native", ["react-native"]),
 }
 
+_INDICATOR_NAMES = frozenset(PROJECT_INDICATORS)
+_PROJECT_DIR_PATTERNS = ('project', 'app', 'service', 'api', 'web', 'backend', 'frontend', 'server')
+_SOURCE_DIR_NAMES = frozenset({'src', 'lib', 'source', 'app', 'components', 'pages', 'api', 'handlers'})
+
+# Language recorded for a code file, keyed by its final suffix
+_LANGUAGE_BY_EXT = {
+    '.py': 'Python',
+    '.js': 'JavaScript/TypeScript',
+    '.jsx': 'JavaScript/TypeScript',
+    '.ts': 'JavaScript/TypeScript',
+    '.tsx': 'JavaScript/TypeScript',
+    '.go': 'Go',
+    '.rs': 'Rust',
+    '.java': 'Java',
+    '.rb': 'Ruby',
+    '.php': 'PHP',
+}
+
+# Project type guessed from file extensions when no indicator file matched,
+# in priority order
+_FALLBACK_TYPE_BY_EXT = {
+    'py': 'Python',
+    'js': 'JavaScript',
+    'ts': 'TypeScript',
+    'jsx': 'React',
+    'tsx': 'React TypeScript',
+    'go': 'Go',
+    'rs': 'Rust',
+    'java': 'Java',
+    'rb': 'Ruby',
+    'php': 'PHP',
+    'swift': 'Swift',
+    'kt': 'Kotlin',
+    'scala': 'Scala',
+    'c': 'C',
+    'cpp': 'C++',
+    'cs': 'C#',
+}
+
+# Scanning is I/O-bound; beyond this many threads extra workers only contend
+_MAX_SCAN_WORKERS = 32
+
+_POOL: Optional[ThreadPoolExecutor] = None
+_POOL_WORKERS = 0
+
+# package.json files above this size are stream-parsed when ijson is available
+_PACKAGE_JSON_STREAM_MIN = 1024 * 1024
+
+
+def _read_package_deps(pkg_file: Path) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Return the (dependencies, devDependencies) mappings of a package.json
+
+    Only the package names are used, so large files are stream-parsed with
+    ijson to collect just those keys instead of decoding the whole document.
+    """
+    with open(pkg_file, 'rb') as f:
+        if ijson is not None and os.fstat(f.fileno()).st_size > _PACKAGE_JSON_STREAM_MIN:
+            sections = {'dependencies': {}, 'devDependencies': {}}
+            for prefix, event, value in ijson.parse(f):
+                if event == 'map_key' and prefix in sections:
+                    sections[prefix][value] = None
+            return sections['dependencies'], sections['devDependencies']
+        
+        # Parse the raw bytes; orjson decodes UTF-8 itself when installed
+        pkg = loads_json(f.read())
+    return pkg.get('dependencies', {}), pkg.get('devDependencies', {})
+
 
 def detect_project_info(files: List[str], path: Path) -> Tuple[str, List[str], List[str]]:
     """
@@ -51,96 +126,71 @@ def detect_project_info(files: List[str], path: Path) -> Tuple[str, List[str], L
     Returns: (project_type, frameworks, dependencies)
     """
     project_type = "Unknown"
-    frameworks = []
-    dependencies = []
+    # Insertion-ordered dicts dedupe like sets but keep detection order, so
+    # the package.json dependencies the caller keeps are the first ones listed
+    frameworks = {}
+    dependencies = {}
     
-    # Check indicator files
-    for file in files:
-        if file in PROJECT_INDICATORS:
-            detected_type, deps = PROJECT_INDICATORS[file]
-            if project_type == "Unknown":
-                project_type = detected_type
-            frameworks.append(detected_type)
-            dependencies.extend(deps)
+    # Check indicator files. Only the few present are visited, in the order
+    # the walk found them, so root-level indicators set the project type
+    present = _INDICATOR_NAMES.intersection(files)
+    for file in sorted(present, key=files.index):
+        detected_type, deps = PROJECT_INDICATORS[file]
+        if project_type == "Unknown":
+            project_type = detected_type
+        frameworks[detected_type] = None
+        dependencies.update(dict.fromkeys(deps))
     
     # Parse package.json for more details
-    if "package.json" in files:
+    if "package.json" in present:
         try:
-            pkg_file = path / "package.json"
-            with open(pkg_file, 'r', encoding='utf-8') as f:
-                pkg = json.load(f)
-                deps = pkg.get('dependencies', {})
-                dev_deps = pkg.get('devDependencies', {})
-                
-                # Detect frameworks
-                if 'react' in deps or 'react' in dev_deps:
-                    frameworks.append('React')
-                if 'vue' in deps:
-                    frameworks.append('Vue')
-                if 'express' in deps:
-                    frameworks.append('Express')
-                if 'fastify' in deps:
-                    frameworks.append('Fastify')
-                if '@nestjs/core' in deps:
-                    frameworks.append('NestJS')
-                
-                # Add dependencies
-                dependencies.extend(list(deps.keys())[:10])  # First 10 deps
+            deps, dev_deps = _read_package_deps(path / "package.json")
+            
+            # Detect frameworks
+            if 'react' in deps or 'react' in dev_deps:
+                frameworks['React'] = None
+            if 'vue' in deps:
+                frameworks['Vue'] = None
+            if 'express' in deps:
+                frameworks['Express'] = None
+            if 'fastify' in deps:
+                frameworks['Fastify'] = None
+            if '@nestjs/core' in deps:
+                frameworks['NestJS'] = None
+            
+            # Add dependencies
+            dependencies.update(dict.fromkeys(list(deps)[:10]))  # First 10 deps
         except Exception as e:
-            logger.debug(f"Error parsing package.json: {e}")
+            logger.debug("Error parsing package.json: %s", e)
     
     # Fallback detection based on file extensions
     if project_type == "Unknown":
-        extensions = {f.split('.')[-1] for f in files if '.' in f}
-        
-        ext_map = {
-            'py': 'Python',
-            'js': 'JavaScript',
-            'ts': 'TypeScript',
-            'jsx': 'React',
-            'tsx': 'React TypeScript',
-            'go': 'Go',
-            'rs': 'Rust',
-            'java': 'Java',
-            'rb': 'Ruby',
-            'php': 'PHP',
-            'swift': 'Swift',
-            'kt': 'Kotlin',
-            'scala': 'Scala',
-            'c': 'C',
-            'cpp': 'C++',
-            'cs': 'C#',
-        }
-        
-        for ext, lang in ext_map.items():
-            if ext in extensions:
-                project_type = lang
-                break
+        extensions = {f.rpartition('.')[2] for f in files if '.' in f}
+        found = _FALLBACK_TYPE_BY_EXT.keys() & extensions
+        if found:
+            # The first extension in table order wins, as before
+            project_type = next(lang for ext, lang in _FALLBACK_TYPE_BY_EXT.items() if ext in found)
     
-    return project_type, list(set(frameworks)), list(set(dependencies))
+    return project_type, list(frameworks), list(dependencies)
 
 
-def is_project_root(path: Path, files: List[str]) -> bool:
+def is_project_root(path: Union[str, Path], files: List[str]) -> bool:
     """Determine if directory is a project root"""
     # Check for common project indicators
-    indicators = set(PROJECT_INDICATORS.keys())
-    
-    if any(f in indicators for f in files):
+    if not _INDICATOR_NAMES.isdisjoint(files):
         return True
     
     # Check for common project structure
-    dir_name = path.name.lower()
+    dir_name = os.path.basename(path).lower()
     
     # Common project patterns
-    project_patterns = ['project', 'app', 'service', 'api', 'web', 'backend', 'frontend', 'server']
-    if any(pattern in dir_name for pattern in project_patterns):
+    if any(pattern in dir_name for pattern in _PROJECT_DIR_PATTERNS):
         try:
-            subdirs = [d for d in path.iterdir() if d.is_dir()]
-            subdir_names = {d.name.lower() for d in subdirs}
+            with os.scandir(path) as it:
+                subdir_names = {entry.name.lower() for entry in it if entry.is_dir()}
             
             # Check for source directories
-            src_indicators = ['src', 'lib', 'source', 'app', 'components', 'pages', 'api', 'handlers']
-            if any(name in subdir_names for name in src_indicators):
+            if not _SOURCE_DIR_NAMES.isdisjoint(subdir_names):
                 return True
         except PermissionError:
             pass
@@ -148,71 +198,213 @@ def is_project_root(path: Path, files: List[str]) -> bool:
     return False
 
 
-def scan_directory(root_path: Path, config: Config) -> Optional[Project]:
+def _walk(top: Path, ignore, top_entries: Optional[List[os.DirEntry]] = None,
+          dir_mtimes: Optional[Dict[str, int]] = None) -> Iterator[Tuple[str, List[os.DirEntry], List[os.DirEntry]]]:
     """
-    Scan a single directory and return Project if it's a valid project
+    Top-down directory walk like os.walk(), but yielding DirEntry objects
+
+    Entries carry their type from the directory listing and cache stat()
+    results, so callers avoid building Path objects or re-stat'ing files.
+    Ignored and hidden directories are pruned, and symlinked directories are
+    not followed (as with os.walk's default). Clearing the yielded dirs list
+    stops descent below the current directory. top_entries, if given, is
+    used instead of listing top again.
+
+    dir_mtimes, if given, receives the mtime_ns of each directory listed,
+    taken just before the listing, so any later change to it is detectable.
+    """
+    stack = [os.fspath(top)]
+    
+    while stack:
+        path = stack.pop()
+        if top_entries is not None:
+            entries, top_entries = top_entries, None
+        else:
+            try:
+                if dir_mtimes is not None:
+                    dir_mtimes[path] = os.stat(path).st_mtime_ns
+                with os.scandir(path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+        
+        dirs = []
+        files = []
+        for entry in entries:
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            (dirs if is_dir else files).append(entry)
+        
+        dirs[:] = [d for d in dirs if d.name not in ignore and not d.name.startswith('.')]
+        yield path, dirs, files
+        
+        # Push in reverse so subdirectories are visited in listing order
+        stack.extend(d.path for d in reversed(dirs) if not d.is_symlink())
+
+
+def _find_project_roots(top: str, ignore,
+                        stamp: bool = False) -> List[Tuple[Path, List[os.DirEntry], Optional[int]]]:
+    """
+    Walk top and return (root, entries, mtime_ns) for the project roots
+    below it, in walk order
+    
+    Detected projects are not descended into, so no returned root lies
+    inside another and no directory needs an "inside a project" check. The
+    root's listing is returned so scan_directory need not read it again,
+    with the root's mtime from just before the listing if stamp is set
+    (None otherwise).
+    """
+    project_roots = []
+    dir_mtimes = {} if stamp else None
+    for root, dirs, entries in _walk(top, ignore, dir_mtimes=dir_mtimes):
+        # Walk paths stay strings; only detected roots become Path objects
+        if is_project_root(root, [entry.name for entry in entries]):
+            mtime_ns = dir_mtimes.get(root) if stamp else None
+            project_roots.append((Path(root), dirs + entries, mtime_ns))
+            dirs.clear()
+    return project_roots
+
+
+def _scan_cache_key(prefix: str, path: Path, config: Config) -> str:
+    """
+    Cache key for scanning path with every setting that changes the output
+
+    Hashed so deep paths cannot exceed file name length limits.
+    """
+    scan_settings = dumps_json([
+        str(path), sorted(config.exts), sorted(config.ignore), config.max_file_mb,
+        config.inactive_days, config.include_active,
+    ])
+    return f"{prefix}_{content_hash(scan_settings)[:32]}"
+
+
+def _load_cached_project(cache_file: Path, config: Config) -> Optional[Project]:
+    """
+    Return a cached project scan if it is fresh and nothing in the project
+    has changed since
+
+    Directory mtimes catch added, removed and renamed entries; files edited
+    in place only change their own (mtime, size), so those are checked too.
     """
     try:
-        files = os.listdir(root_path)
-    except (PermissionError, OSError) as e:
-        logger.debug(f"Cannot access {root_path}: {e}")
+        data = load_cache(cache_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.debug("Error loading project cache %s: %s", cache_file, e)
         return None
     
-    # Check if it's a project root
-    if not is_project_root(root_path, files):
+    try:
+        if time.time() - data['stored_at'] >= config.cache_ttl_hours * 3600:
+            return None
+        for dir_path, mtime_ns in data['dirs']:
+            if os.stat(dir_path).st_mtime_ns != mtime_ns:
+                return None
+        for file_path, mtime_ns, size in data['files']:
+            st = os.lstat(file_path)
+            if st.st_mtime_ns != mtime_ns or st.st_size != size:
+                return None
+    except (OSError, KeyError, TypeError, ValueError):
+        # Vanished paths, or an entry written by an older version
         return None
     
-    logger.info(f"Scanning project: {root_path}")
+    return Project.from_dict(data['project'])
+
+
+def scan_directory(root_path: Path, config: Config, use_cache: bool = True,
+                   entries: Optional[List[os.DirEntry]] = None,
+                   root_mtime: Optional[int] = None) -> Optional[Project]:
+    """
+    Scan a single directory and return Project if it's a valid project
+
+    entries is root_path's listing from a walk that has already identified
+    it as a project root; the directory is then neither listed nor checked
+    again. root_mtime is root_path's mtime_ns from just before that listing;
+    without it the per-project cache cannot be stamped from entries, so the
+    root is listed again when the cache is in use.
+    """
+    if entries is None:
+        try:
+            files = os.listdir(root_path)
+        except (PermissionError, OSError) as e:
+            logger.debug("Cannot access %s: %s", root_path, e)
+            return None
+        
+        # Check if it's a project root
+        if not is_project_root(root_path, files):
+            return None
+    
+    logger.info("Scanning project: %s", root_path)
+    
+    # Unchanged projects are served from a per-project cache, which also
+    # helps when the whole-scan cache misses (another base path, expired)
+    cache_file = None
+    if use_cache and config.enable_cache:
+        cache_file = get_cache_path(_scan_cache_key("proj", root_path, config), config.cache_format)
+        project = _load_cached_project(cache_file, config)
+        if project is not None:
+            logger.info("Loaded project from cache: %s", project.name)
+            return project
     
     try:
+        # Stamps for validating the per-project cache, only kept when it is
+        # in use. Directories are stat'ed before they are listed, so a change
+        # made during the walk leaves a stale mtime and invalidates the cache
+        track = cache_file is not None
+        dir_mtimes = None
+        file_stamps = None
+        if track:
+            dir_mtimes = {}
+            file_stamps = []
+            if entries is not None and root_mtime is not None:
+                dir_mtimes[str(root_path)] = root_mtime
+            else:
+                entries = None
         code_files = []
         all_files = []
         total_size = 0
         latest_mod = 0
         languages = set()
         
+        # Hoist everything the per-file loop touches into locals
         max_size = int(config.max_file_mb * 1024 * 1024)
+        exts = config.exts
+        language_by_ext = _LANGUAGE_BY_EXT
+        add_code_file = code_files.append
+        add_file = all_files.append
         
         # Walk the project directory
-        for root, dirs, dir_files in os.walk(root_path):
-            # Filter ignored directories
-            dirs[:] = [d for d in dirs if d not in config.ignore and not d.startswith('.')]
-            
-            for file in dir_files:
-                file_path = Path(root) / file
+        for _, dirs, dir_files in _walk(root_path, config.ignore, entries, dir_mtimes):
+            for entry in dir_files:
+                # Symlinked files are skipped like symlinked directories, so
+                # linked content is not counted twice and never resolved
+                if entry.is_symlink():
+                    continue
+                file = entry.name
                 
                 try:
-                    if not file_path.exists():
-                        continue
+                    stat = entry.stat(follow_symlinks=False)
+                    size = stat.st_size
+                    total_size += size
+                    add_file(file)
+                    if track:
+                        file_stamps.append([entry.path, stat.st_mtime_ns, size])
                     
-                    stat = file_path.stat()
-                    total_size += stat.st_size
-                    all_files.append(file)
+                    # Check if it's a code file with one C-level call
+                    if not file.endswith(exts):
+                        continue
                     
-                    # Check if it's a code file
-                    for ext in config.exts:
-                        if file.endswith(ext):
-                            if stat.st_size <= max_size:
-                                code_files.append(str(file_path))
-                                latest_mod = max(latest_mod, stat.st_mtime)
-                                
-                                # Track language
-                                lang_ext = ext.lstrip('.')
-                                if lang_ext in ['py']:
-                                    languages.add('Python')
-                                elif lang_ext in ['js', 'jsx', 'ts', 'tsx']:
-                                    languages.add('JavaScript/TypeScript')
-                                elif lang_ext == 'go':
-                                    languages.add('Go')
-                                elif lang_ext == 'rs':
-                                    languages.add('Rust')
-                                elif lang_ext == 'java':
-                                    languages.add('Java')
-                                elif lang_ext == 'rb':
-                                    languages.add('Ruby')
-                                elif lang_ext == 'php':
-                                    languages.add('PHP')
-                            break
+                    if size <= max_size:
+                        add_code_file(entry.path)
+                        if stat.st_mtime > latest_mod:
+                            latest_mod = stat.st_mtime
+                        
+                        # Track language
+                        lang = language_by_ext.get(file[file.rfind('.'):])
+                        if lang:
+                            languages.add(lang)
                 
                 except (OSError, PermissionError):
                     continue
@@ -227,7 +419,7 @@ def scan_directory(root_path: Path, config: Config) -> Optional[Project]:
         is_active = last_mod_date > cutoff_date
         
         if not config.include_active and is_active:
-            logger.debug(f"Skipping active project: {root_path.name}")
+            logger.debug("Skipping active project: %s", root_path.name)
             return None
         
         # Detect project info
@@ -247,85 +439,120 @@ def scan_directory(root_path: Path, config: Config) -> Optional[Project]:
             languages=languages
         )
         
-        logger.info(f"Added project: {project.name} ({proj_type}) - {len(code_files)} code files")
+        logger.info("Added project: %s (%s) - %s code files", project.name, proj_type, len(code_files))
+        
+        if track:
+            try:
+                dump_cache({
+                    'stored_at': time.time(),
+                    'dirs': [[path, mtime_ns] for path, mtime_ns in dir_mtimes.items()],
+                    'files': file_stamps,
+                    'project': project.to_dict(),
+                }, cache_file)
+            except Exception as e:
+                logger.warning("Error saving project cache: %s", e)
+        
         return project
     
     except Exception as e:
-        logger.error(f"Error processing project {root_path}: {e}")
+        logger.error("Error processing project %s: %s", root_path, e)
         return None
 
 
-def scan_projects_parallel(base: Path, config: Config) -> List[Project]:
+def _get_pool(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Return the shared scanning pool, recreating it if the size changed
+
+    Threads are started lazily, so a scan with few project roots only ever
+    spawns as many threads as it has roots.
+    """
+    global _POOL, _POOL_WORKERS
+    max_workers = min(max_workers, _MAX_SCAN_WORKERS)
+    if _POOL is None or _POOL_WORKERS != max_workers:
+        _shutdown_pool()
+        _POOL = ThreadPoolExecutor(max_workers=max_workers)
+        _POOL_WORKERS = max_workers
+    return _POOL
+
+
+def _shutdown_pool():
+    """Shut down the shared scanning pool, if one was started"""
+    global _POOL
+    if _POOL is not None:
+        _POOL.shutdown()
+        _POOL = None
+
+
+atexit.register(_shutdown_pool)
+
+
+def scan_projects_parallel(base: Path, config: Config, use_cache: bool = True) -> List[Project]:
     """
     Enhanced parallel project scanner
     """
     start_time = time.time()
     project_roots = []
     
-    logger.info(f"Scanning {base} for projects...")
-    logger.info(f"Extensions: {config.exts}")
-    logger.info(f"Ignored: {config.ignore}")
-    logger.info(f"Inactive threshold: {config.inactive_days} days")
+    logger.info("Scanning %s for projects...", base)
+    logger.info("Extensions: %s", config.exts)
+    logger.info("Ignored: %s", config.ignore)
+    logger.info("Inactive threshold: %s days", config.inactive_days)
     
-    # First pass: identify potential project roots
+    # First pass: identify potential project roots. Unless base is itself
+    # a project, each top-level subtree is walked as its own shard
     try:
-        for root, dirs, files in os.walk(base):
-            # Filter ignored directories
-            dirs[:] = [d for d in dirs if d not in config.ignore and not d.startswith('.')]
-            
-            root_path = Path(root)
-            
-            # Skip if we're already inside a detected project
-            skip = False
-            for pr in project_roots:
-                try:
-                    if root_path.is_relative_to(pr) and root_path != pr:
-                        skip = True
-                        break
-                except ValueError:
-                    continue
-            
-            if skip:
-                continue
-            
-            # Check if this is a project root
-            if is_project_root(root_path, files):
-                project_roots.append(root_path)
-                # Don't descend into detected projects
-                dirs.clear()
+        shards = []
+        stamp = use_cache and config.enable_cache
+        base_mtimes = {} if stamp else None
+        for root, dirs, entries in _walk(base, config.ignore, dir_mtimes=base_mtimes):
+            if is_project_root(root, [entry.name for entry in entries]):
+                project_roots.append((Path(root), dirs + entries, base_mtimes.get(root) if stamp else None))
+            else:
+                shards = [d.path for d in dirs if not d.is_symlink()]
+            break
+        
+        if config.parallel_scan and len(shards) > 1:
+            # scandir releases the GIL, so threads overlap the directory I/O
+            shard_roots = _get_pool(config.max_workers).map(
+                _find_project_roots, shards, repeat(config.ignore), repeat(stamp))
+        else:
+            shard_roots = (_find_project_roots(shard, config.ignore, stamp) for shard in shards)
+        
+        for roots in shard_roots:
+            project_roots.extend(roots)
     except Exception as e:
-        logger.error(f"Error during directory walk: {e}")
+        logger.error("Error during directory walk: %s", e)
         return []
     
-    logger.info(f"Found {len(project_roots)} potential project roots")
+    logger.info("Found %s potential project roots", len(project_roots))
     
     # Second pass: process projects in parallel
     projects = []
     
     if config.parallel_scan and len(project_roots) > 1:
-        with ThreadPoolExecutor(max_workers=config.max_workers) as executor:
-            future_to_path = {
-                executor.submit(scan_directory, path, config): path
-                for path in project_roots
-            }
-            
-            for future in as_completed(future_to_path):
-                path = future_to_path[future]
-                try:
-                    project = future.result()
-                    if project:
-                        projects.append(project)
-                except Exception as e:
-                    logger.error(f"Error scanning {path}: {e}")
+        executor = _get_pool(config.max_workers)
+        future_to_path = {
+            executor.submit(scan_directory, path, config, use_cache, entries, mtime_ns): path
+            for path, entries, mtime_ns in project_roots
+        }
+        
+        for future in as_completed(future_to_path):
+            path = future_to_path[future]
+            try:
+                project = future.result()
+                if project:
+                    projects.append(project)
+            except Exception as e:
+                logger.error("Error scanning %s: %s", path, e)
     else:
         # Sequential scanning
-        for path in project_roots:
-            project = scan_directory(path, config)
+        for path, entries, mtime_ns in project_roots:
+            project = scan_directory(path, config, use_cache, entries, mtime_ns)
             if project:
                 projects.append(project)
     
     scan_time = time.time() - start_time
-    logger.info(f"Scan complete: Found {len(projects)} projects in {scan_time:.2f}s")
+    logger.info("Scan complete: Found %s projects in %.2fs", len(projects), scan_time)
     
     # Sort by last modified (most recent first)
     projects.sort(key=lambda p: p.last_modified, reverse=True)
@@ -337,25 +564,22 @@ def scan_projects(base: Path, config: Config, use_cache: bool = True) -> ScanRes
     """
     Main entry point for project scanning with optional caching
     """
-    cache_key = f"scan_{base}_{config.inactive_days}_{config.include_active}"
-    cache_file = get_cache_path(cache_key)
+    cache_file = get_cache_path(_scan_cache_key("scan", base, config), config.cache_format)
     
     # Try to load from cache
     if use_cache and config.enable_cache and cache_file.exists():
         try:
             cache_age = time.time() - cache_file.stat().st_mtime
             if cache_age < config.cache_ttl_hours * 3600:
-                with open(cache_file, 'r') as f:
-                    data = json.load(f)
-                result = ScanResult.from_dict(data)
-                logger.info(f"Loaded scan results from cache ({len(result.projects)} projects)")
+                result = ScanResult.from_dict(load_cache(cache_file))
+                logger.info("Loaded scan results from cache (%s projects)", len(result.projects))
                 return result
         except Exception as e:
-            logger.warning(f"Error loading cache: {e}")
+            logger.warning("Error loading cache: %s", e)
     
     # Perform scan
     start_time = time.time()
-    projects = scan_projects_parallel(base, config)
+    projects = scan_projects_parallel(base, config, use_cache=use_cache)
     scan_time = time.time() - start_time
     
     result = ScanResult(
@@ -367,10 +591,9 @@ def scan_projects(base: Path, config: Config, use_cache: bool = True) -> ScanRes
     # Save to cache
     if config.enable_cache:
         try:
-            with open(cache_file, 'w') as f:
-                json.dump(result.to_dict(), f)
+            dump_cache(result.to_dict(), cache_file)
             logger.info("Scan results cached")
         except Exception as e:
-            logger.warning(f"Error saving cache: {e}")
+            logger.warning("Error saving cache: %s", e)
     
     return result
@@ -45,6 +45,11 @@ setup(
         ],
         "performance": [
             "orjson>=3.9.0",
+            "msgpack>=1.0.0",
+            "ijson>=3.1.0",
+            "blake3>=0.3.0",
+            "hyperscan>=0.4.0",
+            "pyahocorasick>=2.0.0",
         ],
         "dev": [
             "pytest>=7.4.0",
@@ -60,6 +65,11 @@ setup(
             "rich>=13.0.0",
             "click>=8.1.0",
             "orjson>=3.9.0",
+            "msgpack>=1.0.0",
+            "ijson>=3.1.0",
+            "blake3>=0.3.0",
+            "hyperscan>=0.4.0",
+            "pyahocorasick>=2.0.0",
         ],
     },
     entry_points={
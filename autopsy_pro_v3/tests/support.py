@@ -0,0 +1,52 @@
+"""Shared helpers for the test modules"""
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from autopsy_pro_v3 import config as config_module
+
+
+def make_tree(root: Path, files):
+    """Create files (relative path -> content) below root"""
+    for rel_path, content in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+
+
+def age_tree(root: Path, days: int = 100):
+    """Backdate every file and directory below root"""
+    stamp = time.time() - days * 86400
+    for path in sorted(root.rglob('*'), reverse=True):
+        os.utime(path, (stamp, stamp))
+    os.utime(root, (stamp, stamp))
+
+
+@contextmanager
+def isolated_config():
+    """
+    Point the config, cache and export locations at a temporary directory
+
+    Yields the directory that stands in for ~/.autopsy_pro.
+    """
+    names = ('CONFIG_DIR', 'CONFIG_FILE', 'CACHE_DIR', 'EXPORT_DIR', 'CONFIG_SIDECAR_FILE')
+    saved = {name: getattr(config_module, name) for name in names}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        config_module.CONFIG_DIR = root
+        config_module.CONFIG_FILE = root / "config.json"
+        config_module.CACHE_DIR = root / "cache"
+        config_module.EXPORT_DIR = root / "exports"
+        config_module.CONFIG_SIDECAR_FILE = root / "cache" / "config.cache.msgpack"
+        config_module._reset_dirs_ready_for_tests()
+        config_module.invalidate_config_cache()
+        try:
+            config_module.ensure_dirs()
+            yield root
+        finally:
+            for name, value in saved.items():
+                setattr(config_module, name, value)
+            config_module._reset_dirs_ready_for_tests()
+            config_module.invalidate_config_cache()
@@ -0,0 +1,91 @@
+"""Tests for the cli module"""
+import contextlib
+import io
+import sys
+from dataclasses import fields, replace
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from autopsy_pro_v3 import cli
+from autopsy_pro_v3.cli import _coerce_config_value
+from autopsy_pro_v3.config import Config
+
+FIELD_TYPES = {f.name: f.type for f in fields(Config)}
+
+
+def test_coerce_bool():
+    """Test that bool fields take true/false in any case and reject anything else"""
+    assert _coerce_config_value("true", FIELD_TYPES['parallel_scan']) is True
+    assert _coerce_config_value("FALSE", FIELD_TYPES['parallel_scan']) is False
+    try:
+        _coerce_config_value("0", FIELD_TYPES['parallel_scan'])
+        raise AssertionError("Expected ValueError for '0'")
+    except ValueError as e:
+        assert "true or false" in str(e), f"Unexpected message: {e}"
+
+
+def test_coerce_numbers():
+    """Test that int and float fields are converted to their declared type"""
+    value = _coerce_config_value("8", FIELD_TYPES['max_workers'])
+    assert value == 8 and isinstance(value, int)
+    value = _coerce_config_value("2.5", FIELD_TYPES['max_file_mb'])
+    assert value == 2.5 and isinstance(value, float)
+
+
+def test_coerce_collections():
+    """Test that tuple and frozenset fields take comma-separated values"""
+    exts = _coerce_config_value(".py, .go,", FIELD_TYPES['exts'])
+    ignore = _coerce_config_value("node_modules,dist", FIELD_TYPES['ignore'])
+    config = replace(Config(), exts=exts, ignore=ignore)
+    assert config.exts == ('.py', '.go'), f"Got {config.exts}"
+    assert config.ignore == frozenset({'node_modules', 'dist'}), f"Got {config.ignore}"
+
+
+def test_config_set_invalid_value_reports_error():
+    """Test that an unconvertible --set value prints an error without saving"""
+    saved = []
+    original_load, original_save = cli.load_config, cli.save_config
+    cli.load_config = lambda: Config()
+    cli.save_config = lambda config: saved.append(config) or True
+    try:
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            code = cli.cmd_config(SimpleNamespace(show=False, reset=False, set="max_workers=abc"))
+    finally:
+        cli.load_config, cli.save_config = original_load, original_save
+
+    assert code == 1, f"Expected exit code 1, got {code}"
+    assert out.getvalue().startswith("Error: Invalid value for max_workers"), out.getvalue()
+    assert not saved, "Invalid values must not be saved"
+
+
+if __name__ == '__main__':
+    print("Running cli tests...")
+
+    tests = [
+        test_coerce_bool,
+        test_coerce_numbers,
+        test_coerce_collections,
+        test_config_set_invalid_value_reports_error,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__}: Unexpected error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(0 if failed == 0 else 1)
@@ -0,0 +1,146 @@
+"""Tests for the config module"""
+import json
+import os
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from autopsy_pro_v3 import config as config_module
+from autopsy_pro_v3.config import (
+    Config, get_cache_path, dump_cache, load_cache, load_config, save_config, invalidate_config_cache
+)
+from autopsy_pro_v3.tests.support import isolated_config
+
+SAMPLE = {'stored_at': 1.5, 'dirs': [['/a', 1], ['/a/b', 2]], 'name': 'café', 'flag': True}
+
+
+def test_cache_format_round_trip():
+    """Test that every cache format writes and reads back the same data"""
+    with isolated_config():
+        for cache_format, suffix in (('json', '.json'), ('msgpack', '.msgpack'), ('pickle', '.pickle')):
+            path = get_cache_path("roundtrip", cache_format)
+            assert path.suffix == suffix, f"Expected {suffix} for {cache_format}, got {path.suffix}"
+            dump_cache(SAMPLE, path)
+            assert load_cache(path) == SAMPLE, f"{cache_format} round trip changed the data"
+
+
+def test_cache_format_falls_back_without_msgpack():
+    """Test that auto and msgpack resolve to pickle when msgpack is missing"""
+    saved = config_module.msgpack
+    config_module.msgpack = None
+    try:
+        with isolated_config():
+            for cache_format in ('auto', 'msgpack'):
+                path = get_cache_path("fallback", cache_format)
+                assert path.suffix == '.pickle', f"Expected .pickle for {cache_format}, got {path.suffix}"
+                dump_cache(SAMPLE, path)
+                assert load_cache(path) == SAMPLE
+    finally:
+        config_module.msgpack = saved
+
+
+def test_cache_format_default_is_not_resolved_in_config():
+    """Test that the saved config keeps the portable "auto" default"""
+    config = Config()
+    assert config.to_dict()['cache_format'] == 'auto'
+    assert not config.validate(), "Default config should be valid"
+    assert Config(cache_format='xml').validate(), "Unknown cache formats should be rejected"
+
+
+def write_config_json(path: Path, **values):
+    """Write a config.json and move its mtime forward so the change is always visible"""
+    data = Config(**values).to_dict()
+    path.write_text(json.dumps(data, indent=2))
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+
+
+def test_config_sidecar_used_until_json_changes():
+    """Test that the msgpack sidecar is reused, then ignored once config.json changes"""
+    if config_module.msgpack is None:
+        return
+    with isolated_config():
+        write_config_json(config_module.CONFIG_FILE, max_workers=4)
+        assert load_config().max_workers == 4
+        assert config_module.CONFIG_SIDECAR_FILE.exists(), "Expected the sidecar to be written"
+
+        # An unchanged config.json is served from the sidecar without parsing JSON
+        invalidate_config_cache()
+        original = config_module.loads_json
+        config_module.loads_json = lambda data: (_ for _ in ()).throw(AssertionError("JSON was parsed"))
+        try:
+            assert load_config().max_workers == 4
+        finally:
+            config_module.loads_json = original
+
+        write_config_json(config_module.CONFIG_FILE, max_workers=6)
+        invalidate_config_cache()
+        assert load_config().max_workers == 6, "Stale sidecar should be ignored"
+        assert load_cache(config_module.CONFIG_SIDECAR_FILE)['data']['max_workers'] == 6
+
+
+def test_config_loads_from_json_without_msgpack():
+    """Test that config.json is read directly when msgpack is missing"""
+    saved = config_module.msgpack
+    config_module.msgpack = None
+    try:
+        with isolated_config():
+            write_config_json(config_module.CONFIG_FILE, max_workers=5)
+            assert load_config().max_workers == 5
+            assert not config_module.CONFIG_SIDECAR_FILE.exists(), "No sidecar without msgpack"
+    finally:
+        config_module.msgpack = saved
+
+
+def test_save_config_only_writes_changes():
+    """Test that save_config round-trips and skips rewriting identical content"""
+    with isolated_config():
+        writes = []
+        original = config_module.atomic_write_bytes
+        config_module.atomic_write_bytes = lambda *args, **kwargs: writes.append(args[0]) or original(*args, **kwargs)
+        try:
+            assert save_config(Config(max_workers=3))
+            assert save_config(Config(max_workers=3))
+            assert len(writes) == 1, f"Identical config should not be rewritten, got {len(writes)} writes"
+            assert save_config(Config(max_workers=7))
+            assert len(writes) == 2, "Changed config should be written"
+        finally:
+            config_module.atomic_write_bytes = original
+
+        assert load_config().max_workers == 7, "Saved config should load back"
+        assert not list(config_module.CONFIG_DIR.glob("*.tmp")), "No temporary files should be left"
+        assert not save_config(Config(max_workers=0)), "Invalid config should not be saved"
+        assert load_config().max_workers == 7
+
+
+if __name__ == '__main__':
+    print("Running config tests...")
+
+    tests = [
+        test_cache_format_round_trip,
+        test_cache_format_falls_back_without_msgpack,
+        test_cache_format_default_is_not_resolved_in_config,
+        test_config_sidecar_used_until_json_changes,
+        test_config_loads_from_json_without_msgpack,
+        test_save_config_only_writes_changes,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__}: Unexpected error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(0 if failed == 0 else 1)
@@ -1,14 +1,23 @@
 """Tests for the extractor module"""
 import sys
+import tempfile
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 
 # Add parent directory to path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
+from autopsy_pro_v3.config import Config
+from autopsy_pro_v3 import extractor
+from autopsy_pro_v3.models import Project
 from autopsy_pro_v3.extractor import (
     compute_complexity,
     compute_documentation_ratio,
-    assess_quality_enhanced
+    assess_quality_enhanced,
+    deduplicate_fragments,
+    extract_fragments_parallel,
+    extract_js_fragments,
+    extract_python_fragments
 )
 
 
@@ -170,6 +179,158 @@ def test_assess_quality_enhanced_no_crash():
             raise AssertionError(f"assess_quality_enhanced crashed on '{code}': {e}")
 
 
+def test_include_nested_controls_function_local_defs():
+    """Test that defs nested in functions follow include_nested while methods are always kept"""
+    code = """
+class Service:
+    def method_one(self, items: list) -> int:
+        total = 0
+        for item in items:
+            total += item
+        return total
+
+
+def outer(items: list) -> int:
+    def inner_helper(value: int) -> int:
+        if value > 3:
+            return value * 2
+        return value
+    return sum(inner_helper(i) for i in items)
+"""
+
+    def extracted_names(include_nested):
+        config = Config(min_quality=1, min_lines=1, include_nested=include_nested)
+        return {f.name for f in extract_python_fragments(code, Path('mod.py'), 'demo', config)}
+
+    default_names = extracted_names(Config().include_nested)
+    assert default_names == {'Service', 'method_one', 'outer', 'inner_helper'}, f"Got {default_names}"
+    top_level_names = extracted_names(False)
+    assert top_level_names == {'Service', 'method_one', 'outer'}, f"Got {top_level_names}"
+
+
+def test_js_shared_line_keeps_pattern_order():
+    """Test that definitions sharing a line are emitted Function before Class, as the per-pattern passes did"""
+    code = (
+        "class Widget { render() { return 1; } } function helper(items) {\n"
+        "  let total = 0;\n"
+        "  for (const item of items) { total += item; }\n"
+        "  return total;\n"
+        "}\n"
+        "export class Panel {\n"
+        "  show() { return true; }\n"
+        "}\n"
+    )
+    config = Config(min_quality=1, min_lines=1)
+    fragments = extract_js_fragments(code, Path('widget.js'), 'demo', config)
+    found = [(f.type, f.name, f.start_line) for f in fragments]
+    assert found == [('JS/Function', 'helper', 1), ('JS/Class', 'Widget', 1), ('JS/Class', 'Panel', 6)], found
+
+    kept = [(f.type, f.name) for f in deduplicate_fragments(fragments)]
+    assert kept == [('JS/Function', 'helper'), ('JS/Class', 'Panel')], f"Got {kept}"
+
+
+HANDLER_TEMPLATE = (
+    "def handler_{i}(items: list) -> int:\n"
+    "    '''Sum the items above the threshold'''\n"
+    "    total = 0\n"
+    "    for item in items:\n"
+    "        if item > {i}:\n"
+    "            total += item\n"
+    "    return total\n"
+)
+
+
+def make_handler_project(root: str, count: int = 12) -> Project:
+    """Write count single-function modules and return a Project for them"""
+    paths = []
+    for i in range(count):
+        path = Path(root) / f"mod_{i}.py"
+        path.write_text(HANDLER_TEMPLATE.format(i=i))
+        paths.append(str(path))
+    return Project(name='demo', path=root, type='python', files=len(paths),
+                   size_bytes=0, last_modified=0.0, code_files=paths)
+
+
+def test_extract_fragments_parallel_matches_sequential():
+    """Test that the process pool yields the same fragments as the sequential path"""
+    with tempfile.TemporaryDirectory() as tmp:
+        project = make_handler_project(tmp)
+
+        def extracted_names(parallel):
+            config = Config(parallel_scan=parallel, max_workers=2, min_quality=1)
+            fragments = extract_fragments_parallel([project], config, use_cache=False)
+            return sorted(f.name for f in fragments)
+
+        sequential = extracted_names(False)
+        assert len(sequential) == 12, f"Expected 12 fragments, got {len(sequential)}"
+        assert extracted_names(True) == sequential, "Parallel extraction should match sequential"
+        assert extractor._EXECUTOR is None, "The pool should be shut down after the run"
+
+
+def test_extract_fragments_parallel_survives_pool_failure():
+    """Test that a pool that breaks mid-run falls back to sequential extraction"""
+    class BrokenPool:
+        def map(self, fn, *iterables, chunksize=1):
+            for i, args in enumerate(zip(*iterables)):
+                if i == 3:
+                    raise BrokenProcessPool("worker was killed")
+                yield fn(*args)
+
+        def shutdown(self):
+            pass
+
+    original = extractor._start_executor
+    extractor._start_executor = lambda max_workers: BrokenPool()
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            project = make_handler_project(tmp)
+            config = Config(parallel_scan=True, max_workers=2, min_quality=1)
+            fragments = extract_fragments_parallel([project], config, use_cache=False)
+    finally:
+        extractor._start_executor = original
+
+    names = sorted(f.name for f in fragments)
+    assert names == sorted(f"handler_{i}" for i in range(12)), f"Expected all 12 fragments, got {names}"
+
+
+def test_extract_fragments_parallel_falls_back_when_pool_cannot_start():
+    """Test that a pool failing to start (e.g. an unguarded __main__) falls back to sequential"""
+    def failing_start(max_workers):
+        raise RuntimeError("An attempt has been made to start a new process before bootstrapping")
+
+    original = extractor._start_executor
+    extractor._start_executor = failing_start
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            project = make_handler_project(tmp)
+            config = Config(parallel_scan=True, max_workers=2, min_quality=1)
+            fragments = extract_fragments_parallel([project], config, use_cache=False)
+    finally:
+        extractor._start_executor = original
+
+    assert len(fragments) == 12, f"Expected all 12 fragments, got {len(fragments)}"
+
+
+def test_extract_fragments_parallel_skips_pool_when_not_worthwhile():
+    """Test that small runs and child processes never start a pool"""
+    started = []
+    original_start, original_child = extractor._start_executor, extractor._in_child_process
+    extractor._start_executor = lambda max_workers: started.append(max_workers)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            project = make_handler_project(tmp)
+            config = Config(parallel_scan=True, max_workers=8, min_quality=1)
+            extractor._in_child_process = lambda: True
+            assert len(extract_fragments_parallel([project], config, use_cache=False)) == 12
+            extractor._in_child_process = lambda: False
+            config = Config(parallel_scan=True, max_workers=1, min_quality=1)
+            assert len(extract_fragments_parallel([project], config, use_cache=False)) == 12
+    finally:
+        extractor._start_executor, extractor._in_child_process = original_start, original_child
+
+    assert not started, f"No pool should be started, got {started}"
+
+
 if __name__ == '__main__':
     print("Running extractor tests...")
 
@@ -182,6 +343,12 @@ if __name__ == '__main__':
         test_assess_quality_enhanced_good_code,
         test_assess_quality_enhanced_poor_code,
         test_assess_quality_enhanced_no_crash,
+        test_include_nested_controls_function_local_defs,
+        test_js_shared_line_keeps_pattern_order,
+        test_extract_fragments_parallel_matches_sequential,
+        test_extract_fragments_parallel_survives_pool_failure,
+        test_extract_fragments_parallel_falls_back_when_pool_cannot_start,
+        test_extract_fragments_parallel_skips_pool_when_not_worthwhile,
     ]
 
     passed = 0
@@ -0,0 +1,209 @@
+"""Tests for the incremental fragment cache"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from autopsy_pro_v3 import extractor, inc_cache
+from autopsy_pro_v3.config import Config
+from autopsy_pro_v3.models import Project
+from autopsy_pro_v3.extractor import _extract_file_job
+from autopsy_pro_v3.inc_cache import IncrementalCache
+from autopsy_pro_v3.tests.support import isolated_config
+
+SOURCE = (
+    "def handler(items: list) -> int:\n"
+    "    '''Sum the items above the threshold'''\n"
+    "    total = 0\n"
+    "    for item in items:\n"
+    "        if item > 3:\n"
+    "            total += item\n"
+    "    return total\n"
+)
+
+
+def make_jobs(root: Path, count: int):
+    """Write count source files and return extraction jobs for them"""
+    paths = []
+    for i in range(count):
+        path = root / f"mod_{i}.py"
+        path.write_text(SOURCE.replace("handler", f"handler_{i}"))
+        paths.append(path)
+    project = Project(name='demo', path=str(root), type='python', files=count,
+                      size_bytes=0, last_modified=0.0, code_files=[str(p) for p in paths])
+    return [(path, project) for path in paths]
+
+
+def run_cached(jobs, config):
+    """Partition jobs through the cache, extract the misses and save"""
+    cache = IncrementalCache.load(config)
+    cached, remaining = cache.partition(jobs)
+    for file_path, project in remaining:
+        fragments, digest = _extract_file_job(str(file_path), project.name, config)
+        cache.store(file_path, fragments, digest)
+    cache.save()
+    return cached, [file_path for file_path, _ in remaining]
+
+
+def test_stat_hit_skips_reading():
+    """Test that files with unchanged (mtime, size) are hits without being hashed"""
+    config = Config(min_quality=1)
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        jobs = make_jobs(Path(tmp), 3)
+        cached, remaining = run_cached(jobs, config)
+        assert not cached and len(remaining) == 3, "First run should miss every file"
+
+        cache = IncrementalCache.load(config)
+        hashed = []
+        original = inc_cache.content_hash
+        inc_cache.content_hash = lambda data: hashed.append(data) or original(data)
+        try:
+            cached, remaining = cache.partition(jobs)
+        finally:
+            inc_cache.content_hash = original
+        assert not remaining, f"Expected all hits, got misses {remaining}"
+        assert len(cached) == 3, f"Expected 3 cached fragments, got {len(cached)}"
+        assert not hashed, "Stat hits should not read file contents"
+
+
+def test_touched_identical_content_hits():
+    """Test that a touched file with identical content is still a hit"""
+    config = Config(min_quality=1)
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        jobs = make_jobs(Path(tmp), 2)
+        run_cached(jobs, config)
+
+        touched = jobs[0][0]
+        st = touched.stat()
+        os.utime(touched, ns=(st.st_atime_ns, st.st_mtime_ns + 10**9))
+        cached, remaining = run_cached(jobs, config)
+        assert not remaining, "Identical content should be a hit"
+        assert len(cached) == 2, f"Expected 2 cached fragments, got {len(cached)}"
+
+
+def test_changed_content_misses():
+    """Test that a file with changed content is re-extracted"""
+    config = Config(min_quality=1)
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        jobs = make_jobs(Path(tmp), 2)
+        run_cached(jobs, config)
+
+        changed = jobs[1][0]
+        changed.write_text(SOURCE.replace("handler", "renamed_handler"))
+        cached, remaining = run_cached(jobs, config)
+        assert remaining == [changed], f"Expected only the changed file to miss, got {remaining}"
+        assert len(cached) == 1, f"Expected 1 cached fragment, got {len(cached)}"
+
+        cached, remaining = run_cached(jobs, config)
+        assert not remaining, "Re-extracted file should be cached again"
+        assert 'renamed_handler' in {f.name for f in cached}
+
+
+def test_fingerprint_change_discards_entries():
+    """Test that changing extraction settings invalidates the cache"""
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        jobs = make_jobs(Path(tmp), 2)
+        run_cached(jobs, Config(min_quality=1))
+
+        for changed in (Config(min_quality=2), Config(min_quality=1, max_file_mb=2.0),
+                        Config(min_quality=1, include_nested=False)):
+            cache = IncrementalCache.load(changed)
+            assert not cache.entries, "Changed settings should discard every entry"
+
+
+def test_max_entries_evicts_oldest():
+    """Test that saving keeps only the newest MAX_ENTRIES entries"""
+    config = Config(min_quality=1)
+    saved_max = inc_cache.MAX_ENTRIES
+    try:
+        with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+            jobs = make_jobs(Path(tmp), 3)
+            run_cached(jobs, config)
+
+            # Make jobs[0] the oldest entry, then save under a lower limit
+            cache = IncrementalCache.load(config)
+            for age, (path, _) in enumerate(reversed(jobs)):
+                cache.entries[str(path)][inc_cache._STORED_AT] -= 100 * age
+            cache._dirty = True
+            inc_cache.MAX_ENTRIES = 2
+            cache.save()
+
+            entries = IncrementalCache.load(config).entries
+            assert len(entries) == 2, f"Expected 2 entries, got {len(entries)}"
+            assert str(jobs[0][0]) not in entries, "The oldest entry should be evicted"
+    finally:
+        inc_cache.MAX_ENTRIES = saved_max
+
+
+def test_failed_extraction_is_not_cached():
+    """Test that a file whose read failed is retried rather than cached as empty"""
+    config = Config(min_quality=1)
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        jobs = make_jobs(Path(tmp), 2)
+        original = extractor.content_hash
+
+        def flaky(data):
+            raise OSError("transient read error")
+
+        extractor.content_hash = flaky
+        try:
+            run_cached(jobs, config)
+        finally:
+            extractor.content_hash = original
+
+        cached, remaining = run_cached(jobs, config)
+        assert len(remaining) == 2, f"Failed files should be retried, got misses {remaining}"
+        cached, remaining = run_cached(jobs, config)
+        assert not remaining and len(cached) == 2, "Successful extraction should then be cached"
+
+
+def test_other_project_misses():
+    """Test that fragments cached for one project are not served to another"""
+    config = Config(min_quality=1)
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        jobs = make_jobs(Path(tmp), 2)
+        run_cached(jobs, config)
+
+        inner = Project(name='inner', path=tmp, type='python', files=2, size_bytes=0,
+                        last_modified=0.0, code_files=[str(path) for path, _ in jobs])
+        renamed = [(path, inner) for path, _ in jobs]
+        cached, remaining = run_cached(renamed, config)
+        assert len(remaining) == 2, "Another project's fragments must not be reused"
+
+        cached, remaining = run_cached(renamed, config)
+        assert not remaining and {f.project for f in cached} == {'inner'}
+
+
+if __name__ == '__main__':
+    print("Running incremental cache tests...")
+
+    tests = [
+        test_stat_hit_skips_reading,
+        test_touched_identical_content_hits,
+        test_changed_content_misses,
+        test_fingerprint_change_discards_entries,
+        test_max_entries_evicts_oldest,
+        test_failed_extraction_is_not_cached,
+        test_other_project_misses,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__}: Unexpected error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(0 if failed == 0 else 1)
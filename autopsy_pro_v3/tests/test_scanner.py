@@ -0,0 +1,228 @@
+"""Tests for the scanner module"""
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from autopsy_pro_v3 import config as config_module
+from autopsy_pro_v3.config import Config
+from autopsy_pro_v3.scanner import (
+    scan_directory, scan_projects_parallel, _find_project_roots, _load_cached_project, _scan_cache_key, _walk
+)
+from autopsy_pro_v3.tests.support import make_tree, age_tree, isolated_config
+
+
+def test_nested_indicator_does_not_override_root_type():
+    """Test that a root-level indicator decides the type over a nested fixture"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "pyproj"
+        make_tree(root, {
+            "requirements.txt": "requests\n",
+            "main.py": "print('hi')\n",
+            "tests/fixtures/package.json": '{"dependencies": {"react": "1"}}',
+        })
+
+        project = scan_directory(root, Config(include_active=True), use_cache=False)
+        assert project is not None, "Expected a project"
+        assert project.type == "Python", f"Expected Python, got {project.type}"
+
+
+def test_project_cache_hit_and_invalidation():
+    """Test that an unchanged project is cached and an added file invalidates it"""
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "pyproj"
+        make_tree(root, {"requirements.txt": "", "main.py": "x = 1\n", "pkg/util.py": "y = 2\n"})
+        age_tree(root)
+        config = Config()
+        cache_file = config_module.get_cache_path(_scan_cache_key("proj", root, config), config.cache_format)
+
+        first = scan_directory(root, config)
+        assert first is not None, "Expected an inactive project"
+        cached = _load_cached_project(cache_file, config)
+        assert cached is not None and cached.to_dict() == first.to_dict(), "Expected a cache hit"
+
+        (root / "pkg" / "extra.py").write_text("z = 3\n")
+        os.utime(root / "pkg" / "extra.py", (first.last_modified, first.last_modified))
+        assert _load_cached_project(cache_file, config) is None, "Added file should invalidate the cache"
+        rescanned = scan_directory(root, config)
+        assert len(rescanned.code_files) == 3, f"Expected 3 code files, got {len(rescanned.code_files)}"
+
+
+def test_project_cache_detects_in_place_edit():
+    """Test that editing a file in place (directory mtime unchanged) invalidates the cache"""
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "pyproj"
+        make_tree(root, {"requirements.txt": "", "main.py": "x = 1\n"})
+        age_tree(root)
+        config = Config()
+
+        assert scan_directory(root, config) is not None, "Expected an inactive project"
+        dir_mtime = root.stat().st_mtime_ns
+        with open(root / "main.py", "a") as f:
+            f.write("y = 2\n")
+        assert root.stat().st_mtime_ns == dir_mtime, "Editing in place should not touch the directory"
+
+        assert scan_directory(root, config) is None, "Edited project is active and should be skipped"
+        assert scan_directory(root, config, use_cache=False) is None
+
+
+def test_project_cache_stamped_before_listing():
+    """Test that a file added after the first pass listed the root invalidates the cache"""
+    with isolated_config(), tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "pyproj"
+        make_tree(root, {"requirements.txt": "", "main.py": "x = 1\n"})
+        age_tree(root)
+        config = Config()
+        cache_file = config_module.get_cache_path(_scan_cache_key("proj", root, config), config.cache_format)
+
+        [(found, entries, mtime_ns)] = _find_project_roots(str(root.parent), config.ignore, stamp=True)
+        assert mtime_ns == root.stat().st_mtime_ns, "Expected the root's mtime from before the listing"
+
+        # Created after the listing, but before scan_directory stamps the cache
+        (root / "late.py").write_text("z = 3\n")
+        os.utime(root / "late.py", (0, 0))
+        project = scan_directory(found, config, entries=entries, root_mtime=mtime_ns)
+        assert len(project.code_files) == 1, "The scan describes the earlier listing"
+        assert _load_cached_project(cache_file, config) is None, "A stale listing must not validate"
+
+        # Without a stamp the listing cannot be trusted, so the root is listed again
+        project = scan_directory(found, config, entries=entries)
+        assert len(project.code_files) == 2, f"Expected a fresh listing, got {project.code_files}"
+        assert _load_cached_project(cache_file, config) is not None
+
+
+def reference_walk(top: Path, ignore):
+    """The os.walk() loop _walk replaced, with the same pruning"""
+    result = []
+    for root, dirs, files in os.walk(top):
+        dirs[:] = [d for d in dirs if d not in ignore and not d.startswith('.')]
+        result.append((root, sorted(dirs), sorted(files)))
+    return sorted(result)
+
+
+def test_walk_matches_os_walk():
+    """Test that _walk prunes, skips symlinks and unreadable dirs like os.walk"""
+    ignore = frozenset({'node_modules'})
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "tree"
+        make_tree(root, {
+            "a.py": "", "src/b.py": "", "src/deep/c.py": "",
+            ".git/config": "", "node_modules/lib/index.js": "",
+            "locked/secret.py": "", ".env": "",
+        })
+        outside = Path(tmp) / "outside"
+        make_tree(outside, {"d.py": ""})
+        (root / "linked").symlink_to(outside, target_is_directory=True)
+        (root / "link.py").symlink_to(root / "a.py")
+
+        # Simulate an unreadable directory; chmod is no barrier when running as root
+        locked = os.fspath(root / "locked")
+        original = os.scandir
+
+        def scandir(path='.'):
+            if os.fspath(path) == locked:
+                raise PermissionError(13, "Permission denied", locked)
+            return original(path)
+
+        os.scandir = scandir
+        try:
+            walked = sorted((path, sorted(d.name for d in dirs), sorted(f.name for f in files))
+                            for path, dirs, files in _walk(root, ignore))
+            expected = reference_walk(root, ignore)
+        finally:
+            os.scandir = original
+
+        assert walked == expected, f"_walk diverged from os.walk:\n{walked}\n{expected}"
+        visited = {path for path, _, _ in walked}
+        assert os.fspath(root / "linked") not in visited, "Symlinked directories must not be followed"
+        assert locked not in visited, "Unreadable directories should be skipped"
+        assert not any('.git' in path or 'node_modules' in path for path in visited)
+        assert os.fspath(root / "src" / "deep") in visited
+
+
+def test_sharded_walk_finds_same_roots():
+    """Test that sharding the first pass finds the same roots as a single walk"""
+    layouts = {
+        "several top-level dirs": {
+            "notes.txt": "", "solo/requirements.txt": "", "solo/app.py": "",
+            "group/a/requirements.txt": "", "group/a/a.py": "",
+            "group/b/go.mod": "", "group/b/main.go": "",
+            "node_modules/x/package.json": "{}", "node_modules/x/x.js": "",
+        },
+        "base is a project root": {
+            "requirements.txt": "", "main.py": "",
+            "sub/package.json": "{}", "sub/index.js": "",
+        },
+        "single top-level dir": {
+            "only/a/requirements.txt": "", "only/a/a.py": "",
+            "only/b/requirements.txt": "", "only/b/b.py": "",
+        },
+    }
+    for label, files in layouts.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            base = Path(tmp) / "base"
+            make_tree(base, files)
+            expected = sorted(str(root) for root, _, _ in _find_project_roots(str(base), Config().ignore))
+            assert expected, f"{label}: fixture should contain project roots"
+
+            for parallel_scan in (True, False):
+                config = Config(include_active=True, parallel_scan=parallel_scan)
+                found = sorted(p.path for p in scan_projects_parallel(base, config, use_cache=False))
+                assert found == expected, f"{label} (parallel_scan={parallel_scan}): {found} != {expected}"
+
+
+def test_scan_with_walk_entries_matches_fresh_scan():
+    """Test that reusing the first-pass listing gives the same Project as a fresh scan"""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "base"
+        make_tree(base, {
+            "web/package.json": '{"dependencies": {"react": "1", "express": "4"}}',
+            "web/src/app.js": "const x = 1;\n", "web/src/view.tsx": "export {};\n",
+            "web/node_modules/dep/index.js": "", "web/.cache/tmp.js": "", "web/README.md": "",
+            "svc/requirements.txt": "flask\n", "svc/app.py": "x = 1\n", "svc/pkg/util.py": "y = 2\n",
+        })
+        age_tree(base)
+        config = Config()
+
+        roots = _find_project_roots(str(base), config.ignore)
+        assert len(roots) == 2, f"Expected 2 roots, got {[str(r) for r, _, _ in roots]}"
+        for root, entries, _ in roots:
+            reused = scan_directory(root, config, use_cache=False, entries=entries)
+            fresh = scan_directory(root, config, use_cache=False)
+            assert fresh is not None, f"Expected a project at {root}"
+            assert reused.to_dict() == fresh.to_dict(), f"Scans of {root} differ"
+
+
+if __name__ == '__main__':
+    print("Running scanner tests...")
+
+    tests = [
+        test_nested_indicator_does_not_override_root_type,
+        test_project_cache_hit_and_invalidation,
+        test_project_cache_detects_in_place_edit,
+        test_project_cache_stamped_before_listing,
+        test_walk_matches_os_walk,
+        test_sharded_walk_finds_same_roots,
+        test_scan_with_walk_entries_matches_fresh_scan,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__}: Unexpected error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(0 if failed == 0 else 1)
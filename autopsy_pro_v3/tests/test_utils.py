@@ -0,0 +1,82 @@
+"""Tests for the utils module"""
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from autopsy_pro_v3 import utils
+from autopsy_pro_v3.utils import atomic_write_bytes
+
+
+def test_atomic_write_concurrent_writers():
+    """Test that concurrent writers of one file never publish a torn write"""
+    payloads = [bytes([65 + i]) * 200_000 for i in range(8)]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.json"
+
+        def writer(data):
+            for _ in range(5):
+                atomic_write_bytes(path, data)
+
+        threads = [threading.Thread(target=writer, args=(data,)) for data in payloads]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert path.read_bytes() in payloads, "File should hold exactly one writer's payload"
+        assert os.listdir(tmp) == ["cache.json"], f"Temporary files left behind: {os.listdir(tmp)}"
+
+
+def test_atomic_write_cleans_up_on_failure():
+    """Test that a failed replace removes the temporary file and keeps the old content"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.json"
+        atomic_write_bytes(path, b"old")
+
+        def failing_replace(src, dst):
+            raise OSError("disk full")
+
+        original = utils.os.replace
+        utils.os.replace = failing_replace
+        try:
+            atomic_write_bytes(path, b"new")
+            raise AssertionError("Expected the write to fail")
+        except OSError:
+            pass
+        finally:
+            utils.os.replace = original
+
+        assert path.read_bytes() == b"old", "Failed write should keep the previous content"
+        assert os.listdir(tmp) == ["cache.json"], f"Temporary files left behind: {os.listdir(tmp)}"
+
+
+if __name__ == '__main__':
+    print("Running utils tests...")
+
+    tests = [
+        test_atomic_write_concurrent_writers,
+        test_atomic_write_cleans_up_on_failure,
+    ]
+
+    passed = 0
+    failed = 0
+
+    for test in tests:
+        try:
+            test()
+            print(f"✓ {test.__name__}")
+            passed += 1
+        except AssertionError as e:
+            print(f"✗ {test.__name__}: {e}")
+            failed += 1
+        except Exception as e:
+            print(f"✗ {test.__name__}: Unexpected error: {e}")
+            failed += 1
+
+    print(f"\n{passed} passed, {failed} failed")
+    sys.exit(0 if failed == 0 else 1)
@@ -1,38 +1,149 @@
 """Utility functions for Autopsy Pro"""
 import hashlib
+import json
 import logging
+import os
+import uuid
 from pathlib import Path
-from typing import Optional
+from typing import Any, Optional, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
 
 logger = logging.getLogger(__name__)
 
+# Inputs above this size are hashed with BLAKE3's internal thread pool
+_BLAKE3_THREADED_MIN = 1024 * 1024
+
 
 def safe_read_text(path: Path, encoding: str = 'utf-8') -> Optional[str]:
     """
     Safely read text file with fallback encodings
     """
+    try:
+        with open(path, 'rb') as f:
+            data = f.read()
+    except Exception as e:
+        logger.error(f"Error reading {path}: {e}")
+        return None
+    
+    text = decode_text(data, encoding)
+    if text is None:
+        logger.warning(f"Could not decode {path} with any encoding")
+    return text
+
+
+def decode_text(data: bytes, encoding: str = 'utf-8') -> Optional[str]:
+    """
+    Decode file contents with fallback encodings
+
+    Newlines are normalized to '\\n' as when reading in text mode.
+    """
     encodings = [encoding, 'utf-8', 'latin-1', 'cp1252']
     
     for enc in encodings:
         try:
-            with open(path, 'r', encoding=enc) as f:
-                return f.read()
+            text = data.decode(enc)
         except UnicodeDecodeError:
             continue
-        except Exception as e:
-            logger.error(f"Error reading {path}: {e}")
-            return None
+        if '\r' in text:
+            text = text.replace('\r\n', '\n').replace('\r', '\n')
+        return text
     
-    logger.warning(f"Could not decode {path} with any encoding")
     return None
 
 
+def dumps_json(obj: Any, pretty: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 JSON bytes, using orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None, ensure_ascii=False).encode('utf-8')
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    Deserialize JSON bytes or text, using orjson when it is installed
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def write_bytes(path: Path, data: bytes, fsync: bool = False, exclusive: bool = False):
+    """
+    Write an already-serialized buffer straight to a file descriptor
+
+    Skips the buffered file object entirely; large payloads normally go out
+    in a single write() syscall. With exclusive=True the file must not
+    already exist.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | getattr(os, 'O_BINARY', 0)
+    flags |= os.O_EXCL if exclusive else os.O_TRUNC
+    fd = os.open(path, flags, 0o666)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        if fsync:
+            os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: Path, data: bytes, fsync: bool = False):
+    """
+    Write bytes to path via a temporary file and os.replace, so readers never
+    observe a partially written file
+
+    Each call creates its own uniquely named temporary file next to path, so
+    concurrent writers of the same file cannot interleave; the temporary file
+    is removed if anything fails.
+    """
+    tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex[:12]}.tmp")
+    try:
+        write_bytes(tmp_path, data, fsync=fsync, exclusive=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hex fingerprint of arbitrary content, for cache keys and change detection
+
+    Uses BLAKE3 (SIMD-accelerated, multi-threaded for large inputs) when it
+    is installed, otherwise SHA-256. Digests are only ever compared with
+    others produced in the same environment.
+    """
+    if blake3 is not None:
+        if len(data) > _BLAKE3_THREADED_MIN:
+            return blake3.blake3(data, max_threads=blake3.blake3.AUTO).hexdigest()
+        return blake3.blake3(data).hexdigest()
+    return hashlib.sha256(data).hexdigest()
+
+
 def stable_uid(project: str, filename: str, line: str) -> str:
     """
     Generate stable unique identifier for a fragment
+
+    A 64-bit BLAKE2b digest gives the same 16 hex characters as the old
+    truncated MD5 at a fraction of the cost for short keys.
     """
     key = f"{project}:{filename}:{line}"
-    return hashlib.md5(key.encode()).hexdigest()[:16]
+    return hashlib.blake2b(key.encode(), digest_size=8).hexdigest()
 
 
 def format_size(bytes_size: int) -> str: